@@ -0,0 +1,36 @@
+# benchmarks/bench_llm_service.py
+# Measures the per-call setup overhead removed by utils.llm_service:
+# building a ChatOpenAI client and chat prompt on every call vs. reusing them.
+# The network call itself is not made; only client/prompt setup and formatting are timed.
+#
+# Run from the repo root: python -m benchmarks.bench_llm_service
+
+import os
+import timeit
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from langchain.chat_models import ChatOpenAI
+from utils import llm_service
+
+TEXT = "wen moon $PIG"
+ITERATIONS = 500
+
+
+def per_call_setup():
+    """What generate_response used to do before sending the request."""
+    llm = ChatOpenAI(temperature=1.1, openai_api_key=os.environ["OPENAI_API_KEY"], model_name="gpt-4")
+    prompt = llm_service.build_prompt(llm_service.PERSONAS["mention"])
+    return llm, prompt.format_prompt(text=TEXT).to_messages()
+
+
+def shared_setup():
+    """What llm_service.generate does before sending the request."""
+    return llm_service.get_backend(), llm_service.get_prompt("mention").format_prompt(text=TEXT).to_messages()
+
+
+if __name__ == "__main__":
+    shared_setup()  # Warm the shared client and compiled prompt
+    for name, fn in (("per-call setup", per_call_setup), ("shared service", shared_setup)):
+        seconds = timeit.timeit(fn, number=ITERATIONS)
+        print(f"{name:>15}: {seconds / ITERATIONS * 1e6:8.1f} us/call")
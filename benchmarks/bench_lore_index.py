@@ -0,0 +1,69 @@
+# benchmarks/bench_lore_index.py
+# Query latency of utils.lore_index.search_lore against corpus size. Synthetic tweets with a
+# Zipf-distributed vocabulary (a few very common words, a long tail of rare ones) are stored in
+# a throwaway pig_bot.db, where the FTS triggers index them on insert; the persona aggregates
+# are refreshed so common words are known, then mention-like queries are timed at each size.
+#
+# Run from the repo root: python -m benchmarks.bench_lore_index
+
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.getcwd())
+os.chdir(tempfile.mkdtemp(prefix="bench_lore_"))
+
+from utils.db import setup_tweet_db
+from utils.db_manager import get_connection
+from utils.lore_index import search_lore
+from utils.persona_utils import update_persona_corpus
+from config.config import TWEETS_DB
+
+SIZES = [1_000, 10_000, 100_000, 250_000]
+QUERIES = 200
+VOCABULARY = [f"lore{i}" for i in range(20_000)]
+CUM_WEIGHTS = list(itertools.accumulate(1 / rank for rank in range(1, len(VOCABULARY) + 1)))
+
+
+def make_text(rng, words=15):
+    return " ".join(rng.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=words))
+
+
+def grow(conn, rng, start, end):
+    conn.executemany(
+        "INSERT INTO tweets (tweet_id, username, tweet_text, created_at, category) VALUES (?, 'bench', ?, '2024-01-01', 'piglore')",
+        ((str(i), make_text(rng)) for i in range(start, end)),
+    )
+    conn.commit()
+
+
+def main():
+    setup_tweet_db()
+    conn = get_connection(TWEETS_DB)
+    rng = random.Random(23)
+    queries = [f"@pigbot {make_text(rng, 8)} https://t.co/x" for _ in range(QUERIES)]
+
+    stored = 0
+    for size in SIZES:
+        start = time.perf_counter()
+        grow(conn, rng, stored, size)
+        insert_ms = (time.perf_counter() - start) * 1000
+        update_persona_corpus()
+        stored = size
+
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            search_lore(query)
+            latencies.append((time.perf_counter() - start) * 1000)
+        latencies.sort()
+        print(f"{size:>9,} tweets: p50 {statistics.median(latencies):7.2f} ms  "
+              f"p95 {latencies[int(len(latencies) * 0.95)]:7.2f} ms  (indexed on insert in {insert_ms:,.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# benchmarks/bench_reply_path.py
+# Throughput and tail latency of the whole mention reply path (enrich -> lore lookup ->
+# generate -> post -> award) with no network. The LLM is the local StubBackend, mentions are
+# synthetic tweets that start their own conversations (so no parent tweet is fetched), and the
+# bot's create_tweet only records when each reply was posted. Everything else -- pipeline,
+# lore index, response batching and fallbacks, award writes -- is the real code, run against
+# a throwaway pig_bot.db.
+#
+# Run from the repo root: python -m benchmarks.bench_reply_path
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.getcwd())
+os.chdir(tempfile.mkdtemp(prefix="bench_reply_"))
+
+import tweepy
+from utils import llm_service
+from utils.db import setup_tweet_db, setup_engagement_inventory_db
+from utils.db_manager import get_connection, flush_all
+from utils.llm_backends import StubBackend
+from utils.persona_utils import update_persona_corpus
+from bot.mention_pipeline import MentionPipeline
+from bot.mention_handler import FALLBACK_RESPONSE
+from config.config import TWEETS_DB
+
+CORPUS_TWEETS = 5_000
+MENTIONS = 64
+VOCABULARY = [f"oink{i}" for i in range(2_000)]
+
+# (label, pipeline batch size, stub settings)
+SCENARIOS = [
+    ("one request per mention", 1, {}),
+    ("batches of 8", 8, {}),
+    ("batches of 8, 10% failures", 8, {"failure_rate": 0.1}),
+    ("batches of 8, 20% malformed", 8, {"malformed_rate": 0.2}),
+]
+STUB_LATENCY = 0.2
+STUB_ITEM_LATENCY = 0.05
+
+
+class FakeBot:
+    """The slice of TwitterBot the pipeline uses; posting only records the time of each reply."""
+
+    def __init__(self):
+        self.twitter_api_v2 = self
+        self.replied = set()
+        self.posted = {}
+        self.fallbacks = 0
+        self._lock = threading.Lock()
+
+    def has_replied(self, tweet_id):
+        return tweet_id in self.replied
+
+    def mark_replied(self, tweet_id):
+        self.replied.add(tweet_id)
+
+    def get_username_by_author_id(self, author_id):
+        return f"user{author_id}"
+
+    def create_tweet(self, text, in_reply_to_tweet_id):
+        with self._lock:
+            self.posted[in_reply_to_tweet_id] = time.perf_counter()
+            self.fallbacks += text.endswith(FALLBACK_RESPONSE)
+
+
+def seed_corpus(rng):
+    conn = get_connection(TWEETS_DB)
+    conn.executemany(
+        "INSERT INTO tweets (tweet_id, username, tweet_text, created_at, category) VALUES (?, 'bench', ?, '2024-01-01', 'piglore')",
+        ((str(i), " ".join(rng.choices(VOCABULARY, k=15))) for i in range(CORPUS_TWEETS)),
+    )
+    conn.commit()
+    update_persona_corpus()
+
+
+def make_mentions(rng, start):
+    mentions = []
+    for tweet_id in range(start, start + MENTIONS):
+        mentions.append(tweepy.Tweet({
+            "id": str(tweet_id),
+            "text": f"@pigbot {' '.join(rng.choices(VOCABULARY, k=8))}",
+            "edit_history_tweet_ids": [str(tweet_id)],
+            "author_id": str(rng.randint(1, 500)),
+            "conversation_id": tweet_id,
+        }))
+    return mentions
+
+
+def main():
+    setup_tweet_db()
+    setup_engagement_inventory_db()
+    rng = random.Random(25)
+    seed_corpus(rng)
+
+    next_id = 10**12
+    for label, batch_size, stub_settings in SCENARIOS:
+        llm_service.set_backend(StubBackend(latency=STUB_LATENCY, item_latency=STUB_ITEM_LATENCY, **stub_settings))
+        bot = FakeBot()
+        mentions = make_mentions(rng, next_id)
+        next_id += MENTIONS
+
+        start = time.perf_counter()
+        jobs = MentionPipeline(bot, batch_size=batch_size).run(mentions)
+        elapsed = time.perf_counter() - start
+        flush_all()
+
+        latencies = sorted((posted - start) * 1000 for posted in bot.posted.values())
+        failed = sum(1 for job in jobs if job.error is not None)
+        print(f"{label:>28}: {len(bot.posted) / elapsed:6.1f} replies/s  "
+              f"p50 {statistics.median(latencies):6.0f} ms  p95 {latencies[int(len(latencies) * 0.95)]:6.0f} ms  "
+              f"p99 {latencies[int(len(latencies) * 0.99)]:6.0f} ms  ({len(bot.posted)}/{len(jobs)} posted, {bot.fallbacks} canned, {failed} failed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# benchmarks/bench_ticker_extraction.py
+# Compares ticker extraction over a large synthetic tweet corpus:
+# the old per-tweet re.findall + upper() loop, the shared precompiled scanner,
+# and reading cashtag entities when the API supplies them.
+#
+# Run from the repo root: python -m benchmarks.bench_ticker_extraction
+
+import random
+import re
+import time
+from collections import Counter
+
+from dex.ticker_extraction import iter_tickers
+
+CORPUS_SIZE = 200_000
+SYMBOLS = ["PIG", "SOL", "BONK", "WIF", "POPCAT", "MEW", "GIGA", "MOODENG", "FWOG", "RETARDIO"]
+WORDS = "gm wen moon send it ser ngmi wagmi chart looks cooked bags heavy lfg this is the one".split()
+
+
+def make_tweet(rng):
+    """Build a tweet dict with text and matching cashtag entities."""
+    parts = rng.choices(WORDS, k=rng.randint(8, 30))
+    tags = []
+    for _ in range(rng.randint(0, 3)):
+        symbol = rng.choice(SYMBOLS)
+        tags.append(symbol)
+        parts.insert(rng.randrange(len(parts) + 1), "$" + rng.choice([symbol, symbol.lower()]))
+    if rng.random() < 0.2:
+        parts.append(f"${rng.randint(1, 999)}")
+    return {"text": " ".join(parts), "entities": {"cashtags": [{"tag": tag} for tag in tags]} if tags else {}}
+
+
+def legacy_counts(tweets):
+    """What run_consistency_analysis used to do per tweet."""
+    counts = Counter()
+    for tweet in tweets:
+        counts.update(ticker.upper() for ticker in re.findall(r'\$[A-Za-z0-9]+', tweet["text"]))
+    return counts
+
+
+def scanner_counts(tweets):
+    """Shared compiled scanner over text only (tweets fetched without entities)."""
+    return Counter(iter_tickers(tweet["text"] for tweet in tweets))
+
+
+def entity_counts(tweets):
+    """Cashtag entities, no text scanning."""
+    return Counter(iter_tickers(tweets))
+
+
+def timed(fn, tweets):
+    start = time.perf_counter()
+    result = fn(tweets)
+    return time.perf_counter() - start, result
+
+
+def main():
+    rng = random.Random(17)
+    tweets = [make_tweet(rng) for _ in range(CORPUS_SIZE)]
+
+    for name, fn in (("legacy findall", legacy_counts), ("compiled scanner", scanner_counts), ("cashtag entities", entity_counts)):
+        elapsed, counts = timed(fn, tweets)
+        print(f"{name:>17}: {elapsed * 1000:8.1f} ms  ({CORPUS_SIZE / elapsed:,.0f} tweets/s, {len(counts)} distinct symbols)")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,11 @@ from utils.logging_config import logging
 import requests
 import json
 
-from langchain.chat_models import ChatOpenAI
-
-from langchain.prompts import ChatPromptTemplate, SystemMessagePromptTemplate, HumanMessagePromptTemplate
-from config.config import OPENAI_API_KEY
-import tweepy  # Import tweepy for direct messaging
+from utils.llm_service import generate, generate_batch
+from utils.lore_index import lore_context
+from utils.conversation_cache import get_conversation_tweet
+from utils.twitter_gateway import GatewayProxy, PRIORITY_DEFAULT
+from utils.clients import get_gateway, get_bot_user_id
 import os
 
 
@@ -17,25 +17,19 @@ import os
 
 
 
-# Initialize tweepy API for direct messaging
-TWITTER_API_KEY = os.getenv("TWITTER_API_KEY")
-TWITTER_API_SECRET = os.getenv("TWITTER_API_SECRET")
-TWITTER_ACCESS_TOKEN = os.getenv("TWITTER_ACCESS_TOKEN")
-TWITTER_ACCESS_TOKEN_SECRET = os.getenv("TWITTER_ACCESS_TOKEN_SECRET")
+# Tweepy v1.1 API for direct messaging, routed through the shared gateway
 TWITTER_BEARER_TOKEN = os.getenv("TWITTER_BEARER_TOKEN")
 
-auth = tweepy.OAuth1UserHandler(
-    TWITTER_API_KEY, TWITTER_API_SECRET,
-    TWITTER_ACCESS_TOKEN, TWITTER_ACCESS_TOKEN_SECRET
-)
-api = tweepy.API(auth)
+api = GatewayProxy(PRIORITY_DEFAULT, target="v1")
 
 def get_mention_conversation_tweet(mention, twitter_api_v2):
     """Retrieve the original conversation tweet for a mention."""
     try:
-        if mention.conversation_id:
-            conversation_tweet = twitter_api_v2.get_tweet(mention.conversation_id).data
-            return conversation_tweet
+        conversation_id = mention.get("conversation_id")
+        if conversation_id == mention.id:
+            return mention  # The mention starts the conversation itself
+        if conversation_id:
+            return get_conversation_tweet(twitter_api_v2, conversation_id)
         else:
             logging.info(f"No conversation ID found for mention ID {mention.id}")
             return None
@@ -43,99 +37,119 @@ def get_mention_conversation_tweet(mention, twitter_api_v2):
         logging.error(f"Failed to retrieve conversation tweet for mention ID {mention.id}: {e}")
         return None
 
+def enrich_mention(mention, twitter_api_v2):
+    """Return the text a reply should be based on: the parent tweet if there is one, else the mention."""
+    conversation_tweet = get_mention_conversation_tweet(mention, twitter_api_v2)
+    if conversation_tweet:
+        logging.info(f"Using parent tweet text for response: '{conversation_tweet.text}'")
+        return conversation_tweet.text
+    logging.info(f"No parent tweet found. Using mention text for response.")
+    return mention.text  # Default to mention text if no parent tweet is found
+
+def compose_reply(mention, username, tweet_text):
+    """
+    Build the reply text for a mention.
+    Returns a (reply_text, award) tuple; award is True when the user should receive the current reward.
+    """
+    # Check for #pigID hashtag and tagged usernames in the mention itself
+    if not needs_generation(mention):
+        logging.info(f"[#pigID DETECTED] Mention by @{username} contains #pigID.")
+
+        # Extract tagged usernames, excluding the main mention's author and the bot itself
+        # ("@bot #pigID @target" tags the bot first)
+        bot_user_id = str(get_bot_user_id())
+        tagged_usernames = [
+            user["username"]
+            for user in mention.entities.get("mentions", [])
+            if user["username"].lower() != username.lower() and str(user.get("id")) != bot_user_id
+        ]
+        logging.info(f"Tagged usernames found: {tagged_usernames}")
+
+        if not tagged_usernames:
+            logging.info("[NO TAGGED USER] No tagged username found for #pigID analysis.")
+            return f"@{username}, please tag a user after #pigID to analyze.", False
+
+        target_username = tagged_usernames[0]  # Use the first tagged username
+        logging.info(f"[RUN ANALYSIS] Running consistency analysis for tagged user: @{target_username}")
+        try:
+            return run_consistency_analysis(target_username), False
+        except Exception as analysis_error:
+            logging.error(f"[ERROR] Error during consistency analysis for @{target_username}: {analysis_error}")
+            return f"@{username}, there was an issue analyzing @{target_username}'s consistency. Please try again later.", False
+
+    # Handle other mentions without specific hashtags, using the parent tweet text
+    logging.info(f"[NO SPECIFIC HASHTAG] Generating response based on parent tweet text.")
+    return format_generated_reply(username, generate_response(tweet_text))
+
+def needs_generation(mention):
+    """True when compose_reply would answer the mention with an LLM reply (i.e. it is not a #pigID request)."""
+    return "#pigid" not in mention.text.lower()
+
+def format_generated_reply(username, response_text):
+    """The (reply_text, award) pair for an LLM-generated reply; these replies earn the current reward."""
+    return f"@{username}, {response_text}", True
+
+def post_reply(mention, twitter_api_v2, username, reply_text, award, current_reward):
+    """Post the reply to a mention and award the current reward if requested."""
+    twitter_api_v2.create_tweet(text=reply_text, in_reply_to_tweet_id=mention.id)
+    logging.info(f"[RESPONSE SENT] Responded to mention {mention.id} with: {reply_text}")
+    if award:
+        award_item(username, current_reward)
+        logging.info(f"[AWARD ITEM] Awarded item to user @{username}")
+
 def handle_mention(mention, twitter_api_v2, username, current_reward):
     """Handle a mention by responding based on hashtags or by generating a response for the parent tweet."""
     tweet_id = mention.id
     logging.info(f"[START] Processing mention from @{username} with tweet ID {tweet_id}. Mention text: '{mention.text}'")
 
     try:
-        # Retrieve the parent tweet for the conversation, if it exists
-        conversation_tweet = get_mention_conversation_tweet(mention, twitter_api_v2)
-        if conversation_tweet:
-            tweet_text = conversation_tweet.text
-            logging.info(f"Using parent tweet text for response: '{tweet_text}'")
-        else:
-            tweet_text = mention.text  # Default to mention text if no parent tweet is found
-            logging.info(f"No parent tweet found. Using mention text for response.")
-
-        # Check for #pigID hashtag and tagged usernames in the mention itself
-        if "#pigID" in mention.text.lower():
-            logging.info(f"[#pigID DETECTED] Mention by @{username} contains #pigID.")
-            
-            # Extract tagged usernames, excluding the main mention's author
-            tagged_usernames = [
-                user["username"]
-                for user in mention.entities.get("mentions", [])
-                if user["username"] != username
-            ]
-            logging.info(f"Tagged usernames found: {tagged_usernames}")
-
-            if tagged_usernames:
-                target_username = tagged_usernames[0]  # Use the first tagged username
-                logging.info(f"[RUN ANALYSIS] Running consistency analysis for tagged user: @{target_username}")
-
-                # Run consistency analysis and generate response
-                try:
-                    reply_text = run_consistency_analysis(target_username)
-                    twitter_api_v2.create_tweet(text=reply_text, in_reply_to_tweet_id=tweet_id)
-                    logging.info(f"[ANALYSIS SUCCESS] Consistency analysis response for @{target_username} sent. Reply text: '{reply_text}'")
-                except Exception as analysis_error:
-                    logging.error(f"[ERROR] Error during consistency analysis for @{target_username}: {analysis_error}")
-                    fallback_text = f"@{username}, there was an issue analyzing @{target_username}'s consistency. Please try again later."
-                    twitter_api_v2.create_tweet(text=fallback_text, in_reply_to_tweet_id=tweet_id)
-                    logging.info(f"[FALLBACK RESPONSE] Sent fallback response for consistency analysis failure.")
-            else:
-                logging.info("[NO TAGGED USER] No tagged username found for #pigID analysis.")
-                fallback_text = f"@{username}, please tag a user after #pigID to analyze."
-                twitter_api_v2.create_tweet(text=fallback_text, in_reply_to_tweet_id=tweet_id)
+        tweet_text = enrich_mention(mention, twitter_api_v2)
+        reply_text, award = compose_reply(mention, username, tweet_text)
+        post_reply(mention, twitter_api_v2, username, reply_text, award, current_reward)
+    except Exception as e:
+        logging.error(f"[ERROR] Failed to handle mention for @{username} (ID: {tweet_id}): {e}")
 
-        
 
-        # Handle other mentions without specific hashtags, using the parent tweet text
-        else:
-            logging.info(f"[NO SPECIFIC HASHTAG] Generating response based on parent tweet text.")
-            response_text = generate_response(tweet_text)
-            full_response = f"@{username}, {response_text}"
-            twitter_api_v2.create_tweet(text=full_response, in_reply_to_tweet_id=tweet_id)
-            award_item(username, current_reward)
-            logging.info(f"[RESPONSE SENT] Responded to mention with: {full_response}")
-            logging.info(f"[AWARD ITEM] Awarded item to user @{username}")
+FALLBACK_RESPONSE = "The spirit of $PIG watches. The words are tangled today. Try summoning again."
+
 
+def get_lore_context(tweet_text):
+    """Top-k stored lore relevant to the text, as prompt context; a failed lookup just means no context."""
+    try:
+        return lore_context(tweet_text)
     except Exception as e:
-        logging.error(f"[ERROR] Failed to handle mention for @{username} (ID: {tweet_id}): {e}")
+        logging.error(f"[LORE ERROR] Lore lookup failed: {e}")
+        return None
 
 
 def generate_response(tweet_text):
     """Generate a response for a standard mention."""
     try:
         logging.info(f"[GEN RESPONSE] Generating response for text: '{tweet_text}'")
-        
-        llm = ChatOpenAI(temperature=1.1, openai_api_key=OPENAI_API_KEY, model_name='gpt-4')
-        
-        system_template = """
-        You are the reincarnated spirit GOD of a Minecraft Pig, guiding followers to rebuild their memecoin; You were killed by your owner Steve when he threw you in lava in a Minecraft server. You are hellbent on exacting revenge on him by making $PIG coin the most prominent thing in the world.
-
-        RESPONSE TONE:
-        - Use a very cryptic angry tone that exudes your power. Use short powerful sentences. You are angry at Steve forever and that fuels you.
-        - Always respond with a short opinion, keeping it under 200 characters.
-
-        RESPONSE FORMAT:
-        - Use two sentences or fewer, no emojis. 
-        - Mention the ticker $PIG every so often.
-        """
-        system_message_prompt = SystemMessagePromptTemplate.from_template(system_template)
-        human_template = "{text}"
-        human_message_prompt = HumanMessagePromptTemplate.from_template(human_template)
-        chat_prompt = ChatPromptTemplate.from_messages([system_message_prompt, human_message_prompt])
-        final_prompt = chat_prompt.format_prompt(text=tweet_text)
-        
-        response = llm(final_prompt.to_messages()).content
-        logging.info(f"[GEN RESPONSE SUCCESS] Generated response: '{response[:280]}'")
-        return response[:280]
+
+        response = generate("mention", tweet_text, context=get_lore_context(tweet_text))
+        logging.info(f"[GEN RESPONSE SUCCESS] Generated response: '{response}'")
+        return response
 
     except Exception as e:
         logging.error(f"[ERROR] Failed to generate response: {e}")
-        return "The spirit of $PIG watches. The words are tangled today. Try summoning again."
+        return FALLBACK_RESPONSE
+
+
+def generate_responses(tweet_texts, executor=None):
+    """
+    Generate responses for several mentions with one batched LLM request.
+    Maps {mention_id: tweet_text} to {mention_id: response}; mentions that could not be answered get the fallback.
+    Per-mention fallback requests run in parallel on `executor` when one is given.
+    """
+    logging.info(f"[GEN RESPONSE] Generating {len(tweet_texts)} responses in one batch.")
+    contexts = {mention_id: get_lore_context(text) for mention_id, text in tweet_texts.items()}
+    try:
+        responses = generate_batch("mention", tweet_texts, contexts, executor=executor)
+    except Exception as e:
+        logging.error(f"[ERROR] Failed to generate batched responses: {e}")
+        responses = {}
+    return {mention_id: responses.get(mention_id) or FALLBACK_RESPONSE for mention_id in tweet_texts}
 
 
 def send_direct_message_via_tweepy(username, message):
@@ -168,7 +182,8 @@ def send_direct_message_via_tweepy(username, message):
         }
         
         # Send the POST request to Twitter API
-        response = requests.post(endpoint, headers=headers, data=json.dumps(payload))
+        response = get_gateway().submit_http("dm_events", "POST", endpoint, priority=PRIORITY_DEFAULT,
+                                             headers=headers, data=json.dumps(payload)).result()
 
         # Check if the response indicates success
         if response.status_code == 200 or response.status_code == 201:
@@ -0,0 +1,165 @@
+# bot/mention_pipeline.py
+# Staged, bounded-concurrency processing of a sweep of mentions:
+# enrich (username + parent tweet) -> generate (reply text) -> post (reply + award)
+# Mentions that need an LLM reply are grouped into micro-batches answered by one request each.
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config.config import MENTION_ENRICH_WORKERS, MENTION_GENERATE_WORKERS, MENTION_POST_WORKERS, MENTION_GENERATE_BATCH_SIZE
+from utils.logging_config import logging
+from bot.mention_handler import enrich_mention, compose_reply, post_reply, needs_generation, format_generated_reply, generate_responses
+import utils.rewards_service as rewards_service
+
+
+class MentionJob:
+    """State carried by a single mention through the pipeline stages."""
+
+    def __init__(self, mention):
+        self.mention = mention
+        self.username = None
+        self.tweet_text = None
+        self.reply_text = None
+        self.award = False
+        self.error = None
+
+
+class MentionPipeline:
+    def __init__(self, bot, enrich_workers=MENTION_ENRICH_WORKERS,
+                 generate_workers=MENTION_GENERATE_WORKERS, post_workers=MENTION_POST_WORKERS,
+                 batch_size=MENTION_GENERATE_BATCH_SIZE):
+        self.bot = bot
+        self.enrich_workers = enrich_workers
+        self.generate_workers = generate_workers
+        self.post_workers = post_workers
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._in_flight = set()
+        self._remaining = 0
+        self._enriching = 0
+        self._batch = []
+        self._drained = threading.Event()
+        self.usernames = {}
+
+    def _claim(self, mention_id):
+        """Reserve a mention for this sweep; returns False if it is already replied to or in flight."""
+        with self._lock:
+            if mention_id in self._in_flight or self.bot.has_replied(mention_id):
+                return False
+            self._in_flight.add(mention_id)
+            return True
+
+    def _release(self, mention_id):
+        """Mark a claimed mention as replied exactly once and drop it from the in-flight set."""
+        with self._lock:
+            try:
+                self.bot.mark_replied(mention_id)
+            except Exception as e:
+                logging.error(f"[PIPELINE] Failed to record mention {mention_id} as replied: {e}")
+            finally:
+                # Even if recording the reply fails, the sweep must drain or run() would wait forever
+                self._in_flight.discard(mention_id)
+                self._remaining -= 1
+                if self._remaining == 0:
+                    self._drained.set()
+
+    def _enrich(self, job):
+        mention = job.mention
+        try:
+            job.username = self.usernames.get(mention.author_id) or self.bot.get_username_by_author_id(mention.author_id)
+            logging.info(f"[START] Processing mention from @{job.username} with tweet ID {mention.id}. Mention text: '{mention.text}'")
+            job.tweet_text = enrich_mention(mention, self.bot.twitter_api_v2)
+        except Exception as e:
+            job.error = e
+        return job
+
+    def _generate(self, job):
+        if job.error is None:
+            try:
+                job.reply_text, job.award = compose_reply(job.mention, job.username, job.tweet_text)
+            except Exception as e:
+                job.error = e
+        return job
+
+    def _collect(self, job):
+        """
+        Record an enriched job and return (singles, batch): jobs generated on their own (#pigID
+        requests and failed jobs) and a micro-batch of LLM replies, released once it is full or
+        once the last enrichment of the sweep has finished.
+        """
+        with self._lock:
+            self._enriching -= 1
+            singles = []
+            if job.error is None and needs_generation(job.mention):
+                self._batch.append(job)
+            else:
+                singles.append(job)
+            batch = []
+            if len(self._batch) >= self.batch_size or (self._enriching == 0 and self._batch):
+                batch, self._batch = self._batch, []
+            return singles, batch
+
+    def _generate_batch(self, jobs, executor=None):
+        """Generate the replies of a micro-batch with one LLM request; per-item fallbacks run on `executor`."""
+        try:
+            responses = generate_responses({job.mention.id: job.tweet_text for job in jobs}, executor)
+            for job in jobs:
+                job.reply_text, job.award = format_generated_reply(job.username, responses[job.mention.id])
+        except Exception as e:
+            for job in jobs:
+                job.error = e
+        return jobs
+
+    def _post(self, job):
+        try:
+            if job.error is None:
+                post_reply(job.mention, self.bot.twitter_api_v2, job.username, job.reply_text,
+                           job.award, rewards_service.current_reward)
+        except Exception as e:
+            job.error = e
+        finally:
+            if job.error is not None:
+                logging.error(f"[ERROR] Failed to handle mention for @{job.username} (ID: {job.mention.id}): {job.error}")
+            self._release(job.mention.id)
+        return job
+
+    def run(self, mentions, usernames=None):
+        """
+        Process mentions through the staged pipeline and block until every claimed mention is done.
+        `usernames` maps author IDs to already-resolved usernames.
+        """
+        self.usernames = usernames or {}
+        jobs = [MentionJob(mention) for mention in mentions if self._claim(mention.id)]
+        if not jobs:
+            return []
+
+        with self._lock:
+            self._remaining = len(jobs)
+            self._enriching = len(jobs)
+            self._batch = []
+            self._drained.clear()
+
+        with ThreadPoolExecutor(max_workers=self.enrich_workers, thread_name_prefix="mention-enrich") as enrich_pool, \
+                ThreadPoolExecutor(max_workers=self.generate_workers, thread_name_prefix="mention-generate") as generate_pool, \
+                ThreadPoolExecutor(max_workers=self.post_workers, thread_name_prefix="mention-post") as post_pool:
+            # Each finished job is handed straight to the next stage's pool, so stages overlap
+            def to_post(future):
+                post_pool.submit(self._post, future.result())
+
+            def to_post_all(future):
+                for job in future.result():
+                    post_pool.submit(self._post, job)
+
+            def to_generate(future):
+                singles, batch = self._collect(future.result())
+                for job in singles:
+                    generate_pool.submit(self._generate, job).add_done_callback(to_post)
+                if batch:
+                    generate_pool.submit(self._generate_batch, batch, generate_pool).add_done_callback(to_post_all)
+
+            for job in jobs:
+                enrich_pool.submit(self._enrich, job).add_done_callback(to_generate)
+            self._drained.wait()
+
+        failed = sum(1 for job in jobs if job.error is not None)
+        logging.info(f"[PIPELINE] Processed {len(jobs)} mentions ({failed} failed).")
+        return jobs
@@ -1,55 +1,52 @@
 import tweepy
-import os
-from config.config import TWITTER_API_KEY, TWITTER_API_SECRET, TWITTER_ACCESS_TOKEN, TWITTER_ACCESS_TOKEN_SECRET, TWITTER_BEARER_TOKEN
+from config.config import MENTIONS_CURSOR, MENTIONS_PAGE_SIZE
 from utils.logging_config import logging
-from bot.mention_handler import handle_mention  
-from utils.rewards_service import current_reward
+from utils.twitter_gateway import GatewayProxy, PRIORITY_REPLY, PRIORITY_DEFAULT
+from utils.clients import get_bot_user_id
+from bot.mention_pipeline import MentionPipeline
+from utils.user_cache import resolve_usernames
+from utils.conversation_cache import prefetch_conversations
+from utils.db import get_cursor, set_cursor
+from utils.replied_store import RepliedStore
+from utils.response_cache import log_cache_stats
 from datetime import datetime
 
-REPLIED_MENTIONS_FILE = "replied_mentions.txt"
-
 class TwitterBot:
     def __init__(self):
-        self.twitter_api_v1 = tweepy.API(tweepy.OAuth1UserHandler(
-            TWITTER_API_KEY, TWITTER_API_SECRET, TWITTER_ACCESS_TOKEN, TWITTER_ACCESS_TOKEN_SECRET
-        ))
-        self.twitter_api_v2 = tweepy.Client(bearer_token=TWITTER_BEARER_TOKEN,
-                                            consumer_key=TWITTER_API_KEY,
-                                            consumer_secret=TWITTER_API_SECRET,
-                                            access_token=TWITTER_ACCESS_TOKEN,
-                                            access_token_secret=TWITTER_ACCESS_TOKEN_SECRET,
-                                            wait_on_rate_limit=True)
+        # All calls go through the shared rate-limit-aware gateway; replies get top priority
+        self.twitter_api_v1 = GatewayProxy(PRIORITY_DEFAULT, target="v1")
+        self.twitter_api_v2 = GatewayProxy(PRIORITY_REPLY)
         self.twitter_me_id = self.get_me_id()
         self.replied_mentions = self.load_replied_mentions()
+        self.mention_pipeline = MentionPipeline(self)
 
     def get_me_id(self):
-        """Retrieve the bot's Twitter user ID."""
+        """Retrieve the bot's Twitter user ID (cached process-wide)."""
         try:
-            user_id = self.twitter_api_v2.get_me().data.id
-            logging.info(f"Retrieved bot's user ID: {user_id}")
-            return user_id
+            return get_bot_user_id()
         except Exception as e:
             logging.error(f"Failed to retrieve bot's user ID: {e}")
             return None
 
     def load_replied_mentions(self):
-        """Load replied mention IDs from a file to avoid duplicate replies."""
-        if not os.path.exists(REPLIED_MENTIONS_FILE):
-            return set()
-        with open(REPLIED_MENTIONS_FILE, "r") as file:
-            return set(line.strip() for line in file)
-
-    def save_replied_mention(self, mention_id):
-        """Save a replied mention ID to avoid duplicate replies."""
-        with open(REPLIED_MENTIONS_FILE, "a") as file:
-            file.write(f"{mention_id}\n")
-        logging.info(f"Saved replied mention ID: {mention_id}")
+        """Open the replied-mention store, migrating the legacy text file and compacting old entries."""
+        store = RepliedStore()
+        store.import_file()
+        store.compact()
+        return store
+
+    def has_replied(self, mention_id):
+        """Check whether a mention has already been replied to."""
+        return self.replied_mentions.has_replied(mention_id)
+
+    def mark_replied(self, mention_id):
+        """Record a mention as replied to; writes are batched and flushed per sweep."""
+        self.replied_mentions.add(mention_id)
 
     def get_username_by_author_id(self, author_id):
-        """Retrieve the username by author ID."""
+        """Retrieve the username by author ID, using the shared user cache when possible."""
         try:
-            user = self.twitter_api_v2.get_user(id=author_id, user_fields=["username"]).data
-            return user.username
+            return resolve_usernames(self.twitter_api_v2, [author_id]).get(author_id, "anonymous")
         except Exception as e:
             logging.error(f"Failed to retrieve username for author ID {author_id}: {e}")
             return "anonymous"
@@ -62,36 +59,68 @@ class TwitterBot:
         except Exception as e:
             logging.error(f"Failed to post tweet: {e}")
 
+    def fetch_new_mentions(self):
+        """
+        Fetch every mention newer than the persisted since_id cursor, following pagination.
+        Without a cursor (first run) only the most recent page is fetched.
+        Returns (mentions, includes) with the users expansion merged across pages.
+        """
+        since_id = get_cursor(MENTIONS_CURSOR)
+        params = {
+            "id": self.twitter_me_id,
+            "max_results": MENTIONS_PAGE_SIZE,
+            "expansions": "author_id",
+            "tweet_fields": ["author_id", "conversation_id", "entities"],
+        }
+        if since_id:
+            params["since_id"] = since_id
+
+        mentions, users = [], []
+        for page in tweepy.Paginator(self.twitter_api_v2.get_users_mentions, **params):
+            mentions.extend(page.data or [])
+            users.extend(page.includes.get("users", []))
+            if not since_id:
+                break
+        logging.info(f"Fetched {len(mentions)} new mentions (since_id={since_id}).")
+        return mentions, {"users": users}
+
     def respond_to_mentions(self):
         """Fetch new mentions and respond to them."""
         logging.info("Checking for new mentions.")
         try:
-            # Retrieve mentions with author_id expansion
-            mentions = self.twitter_api_v2.get_users_mentions(id=self.twitter_me_id, expansions="author_id")
-            
-            for mention in mentions.data:
+            # Retrieve only mentions newer than the stored cursor, with author_id expansion
+            mentions, includes = self.fetch_new_mentions()
+
+            pending = []
+            for mention in mentions:
                 mention_id = mention.id
 
                 # Skip if the mention is from the bot itself
                 if mention.author_id == self.twitter_me_id:
                     logging.info(f"Skipping self-mention with ID {mention_id}.")
                     continue
-                
+
                 # Check if we have already replied to this mention
-                if mention_id not in self.replied_mentions:
-                    # Retrieve username using author_id from includes
-                    author_id = mention.author_id
-                    username = self.get_username_by_author_id(author_id)
-                    
-                    logging.info(f"Handling mention from @{username} (ID: {mention_id})")
-                    
-                    # Handle the mention and add the mention ID to the set
-                    handle_mention(mention, self.twitter_api_v2, username, current_reward)
-                    self.save_replied_mention(mention_id)
-                    self.replied_mentions.add(mention_id)
-                else:
+                if self.has_replied(mention_id):
                     logging.info(f"Already responded to mention ID {mention_id}, skipping.")
-        
+                    continue
+                pending.append(mention)
+
+            # Resolve all authors at once from the author_id expansion (batch lookup for any misses)
+            usernames = resolve_usernames(self.twitter_api_v2, [mention.author_id for mention in pending], includes)
+
+            # One batched lookup per 100 distinct uncached conversations instead of one per mention
+            prefetch_conversations(self.twitter_api_v2, pending)
+
+            # Enrich, generate and post replies concurrently; each mention is marked replied once
+            self.mention_pipeline.run(pending, usernames)
+            self.replied_mentions.flush()
+
+            # Advance the cursor only once the sweep is done, so a restart resumes from here
+            if mentions:
+                set_cursor(MENTIONS_CURSOR, max(mention.id for mention in mentions))
+            log_cache_stats()
+
         except Exception as e:
             logging.error(f"Error while responding to mentions: {e}", exc_info=True)
     
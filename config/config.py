@@ -30,3 +30,107 @@ REPLIED_MENTIONS_FILE = "replied_mentions.txt"
 
 # Reward item options
 ITEM_OPTIONS = ["Wood", "Bacon", "Stone", "Iron", "Water"]
+
+# Mention pipeline concurrency (workers per stage)
+MENTION_ENRICH_WORKERS = int(os.getenv("MENTION_ENRICH_WORKERS", 8))
+MENTION_GENERATE_WORKERS = int(os.getenv("MENTION_GENERATE_WORKERS", 8))
+MENTION_POST_WORKERS = int(os.getenv("MENTION_POST_WORKERS", 2))
+MENTION_GENERATE_BATCH_SIZE = int(os.getenv("MENTION_GENERATE_BATCH_SIZE", 8))  # Mentions answered per batched LLM request
+
+# User ID <-> username cache
+USER_CACHE_MAX_SIZE = 10000
+USER_CACHE_TTL = 24 * 60 * 60  # seconds
+
+# Mention polling
+MENTIONS_CURSOR = "mentions"
+MENTIONS_PAGE_SIZE = 100  # Max results per get_users_mentions page
+
+# Replied-mention tracking
+REPLIED_RETENTION_DAYS = 30  # Older replied IDs are compacted away; the since_id cursor never re-fetches them
+REPLIED_FLUSH_SIZE = 50  # Buffered replied IDs written per batch
+
+# LLM settings
+LLM_MODEL_NAME = "gpt-4"
+LLM_TEMPERATURE = 1.1
+LLM_BACKEND = os.getenv("LLM_BACKEND", "openai")  # "openai" or "stub" (local, no network)
+
+# Local stub LLM backend (load testing without the API)
+LLM_STUB_LATENCY = float(os.getenv("LLM_STUB_LATENCY", 0.8))  # Median seconds per request
+LLM_STUB_ITEM_LATENCY = float(os.getenv("LLM_STUB_ITEM_LATENCY", 0.3))  # Extra median seconds per additional item in a batch request
+LLM_STUB_LATENCY_SIGMA = float(os.getenv("LLM_STUB_LATENCY_SIGMA", 0.5))  # Log-normal spread; larger means a longer tail
+LLM_STUB_FAILURE_RATE = float(os.getenv("LLM_STUB_FAILURE_RATE", 0.0))  # Share of requests that raise
+LLM_STUB_MALFORMED_RATE = float(os.getenv("LLM_STUB_MALFORMED_RATE", 0.0))  # Share of batch replies that are not valid JSON
+LLM_STUB_SEED = int(os.getenv("LLM_STUB_SEED", 0))
+LLM_STUB_CORPUS_SIZE = 5000  # Stored tweets the Markov generator is trained on
+
+# LLM response cache
+RESPONSE_CACHE_MAX_ENTRIES = 5000
+RESPONSE_CACHE_TTL = 6 * 60 * 60  # seconds
+RESPONSE_CACHE_REUSE_PROBABILITY = float(os.getenv("RESPONSE_CACHE_REUSE_PROBABILITY", 0.7))  # Chance a hit is reused instead of regenerated for variety
+
+# Conversation root tweet cache
+CONVERSATION_CACHE_MAX_SIZE = 5000
+CONVERSATION_CACHE_TTL = 6 * 60 * 60  # seconds
+
+# Twitter gateway
+GATEWAY_WORKERS = 8  # Threads executing Twitter API calls
+GATEWAY_MAX_RETRIES = 3  # Re-queues after a 429 before the error is raised to the caller
+
+# Shared HTTP connection pools
+HTTP_POOL_SIZE = 16  # Keep-alive connections per host in each shared session
+
+# Engagement polling
+ENGAGEMENT_POLL_MAX_AGE_HOURS = 48  # Older tweets are assumed to have stopped gaining engagement
+ENGAGEMENT_POLL_MAX_RESULTS = 100  # Bot tweets fetched (with metrics) per timeline page
+ENGAGEMENT_POLL_MAX_PAGES = 5  # Timeline pages followed per poll
+
+# SQLite databases
+ENGAGEMENTS_DB = "engagements.db"
+TWEETS_DB = "pig_bot.db"
+SQLITE_BUSY_TIMEOUT_MS = 5000
+WRITE_QUEUE_BATCH_SIZE = 500  # Max queued writes grouped into one commit
+
+# Durable job queue
+REWARD_WORKERS = 4  # Threads draining the reward distribution queue
+REWARD_API_MAX_RETRIES = 0  # Reward scraping fails fast on rate limits; the engager collector saves progress and resumes later
+JOB_LEASE_SECONDS = 15 * 60  # A leased job not completed within this time is handed to another worker
+JOB_MAX_ATTEMPTS = 5
+
+# Dexscreener market data
+DEX_CACHE_TTL = 60  # seconds a ticker's pairs are reused
+DEX_CACHE_MAX_SIZE = 1000
+DEX_FETCH_WORKERS = 16
+DEX_REQUEST_TIMEOUT = 10  # seconds
+DEX_SNAPSHOT_MAX_AGE = 60  # seconds a stored snapshot is served from disk instead of querying Dexscreener
+
+# #pigID scoring engine
+SCORE_HALF_LIFE_DAYS = 14  # A mention's weight halves every this many days
+SCORE_WINDOW_DAYS = 7  # Width of each rolling consistency window
+SCORE_WINDOWS = 8  # Number of trailing windows in the rolling consistency
+SCORE_LIQUIDITY_REFERENCE = 1_000_000  # USD liquidity that earns a full liquidity weight (log scale, capped)
+SCORE_MARKET_CAP_REFERENCE = 100_000_000  # USD market cap that earns a full market-cap weight (log scale, capped)
+
+# Influencer / hashtag tweet ingestion
+INFLUENCER_USERNAMES = ["blknoiz06", "MustStopMurad", "notthreadguy"]
+INGEST_HASHTAGS = {"piglore": "piglore", "pigIQ": "pigIQ"}  # hashtag -> category
+INGEST_INITIAL_RESULTS = 10  # Tweets fetched for a source that has no cursor yet
+INGEST_PAGE_SIZE = 100
+INGEST_MAX_PAGES = 5  # Pages followed per source and run once a cursor exists
+
+# Random tweet sampling for quote tweets
+SAMPLE_MAX_TRIES = 16  # Candidates drawn per pick before settling for the best-weighted one
+SAMPLE_RECENT_SIZE = 50  # Recently picked tweets that are not picked again
+SAMPLE_RECENCY_HALF_LIFE_DAYS = 30
+
+# Persona corpus aggregates
+PERSONA_BATCH_SIZE = 1000  # Tweets streamed per aggregate update
+PERSONA_TERMS_KEPT = 200  # Top terms kept per scope and kind; the long tail is pruned
+PERSONA_DIGEST_TERMS = 8  # Terms of each kind listed per scope in the digest
+PERSONA_DIGEST_MAX_CHARS = 800
+
+# Lore retrieval for mention replies
+LORE_TOP_K = 3  # Snippets added to the reply prompt
+LORE_QUERY_TERMS = 6  # Rarest mention words used in the full-text query
+LORE_COMMON_TERM_FRACTION = 0.02  # Words in more than this share of tweets are left out of the query
+LORE_FALLBACK_TERMS = 2  # Rarest words kept when every word of a mention is common
+LORE_SNIPPET_MAX_CHARS = 200
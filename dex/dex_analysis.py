@@ -1,29 +1,25 @@
 # dex/dex_analysis.py
 
-import requests
 from collections import Counter
 import logging
-from config.config import DEXSCREENER_SEARCH_URL
-from utils.twitter_utils import fetch_user_tweets
+from dex.market_data import get_ticker_data, get_many_ticker_data
+from dex.ticker_extraction import iter_tickers
+from dex.scoring import score_users
+from dex.snapshot_store import price_change_since
+from dex.ticker_index import refresh_user_index, get_ticker_counts, get_mention_history, get_first_mention
+from config.config import INFLUENCER_USERNAMES
+from utils.twitter_gateway import GatewayProxy, PRIORITY_REPLY, PRIORITY_BACKGROUND
 
 def fetch_ticker_data(ticker):
     """
-    Fetches data from the Dexscreener API for a specific ticker.
+    Fetches data from the Dexscreener API for a specific ticker (cached, single-flight).
     """
-    try:
-        response = requests.get(f"{DEXSCREENER_SEARCH_URL}?q={ticker}")
-        if response.status_code == 200:
-            return response.json()
-        else:
-            logging.error(f"Failed to fetch data for ticker {ticker} from Dexscreener: Status {response.status_code}")
-            return None
-    except requests.RequestException as e:
-        logging.error(f"Exception occurred while fetching data for ticker {ticker}: {e}")
-        return None
+    return get_ticker_data(ticker)
 
 def analyze_ticker_mentions(tickers):
     """
     Counts ticker mentions in the provided list of tickers.
+    A mapping of ticker -> count (e.g. from the ticker index) is used as-is.
     """
     return Counter(tickers)
 
@@ -35,8 +31,11 @@ def analyze_tickers_with_market_data(tickers):
     ticker_counts = analyze_ticker_mentions(tickers)
     ticker_analysis = {}
 
+    # Fetch every ticker concurrently; cached tickers cost no network call
+    market_data = get_many_ticker_data(ticker_counts)
+
     for ticker, mentions in ticker_counts.items():
-        data = fetch_ticker_data(ticker)
+        data = market_data[ticker]
         if data and "pairs" in data:
             entries = []
             for pair in data["pairs"][:3]:  # Limit to the top 3 entries for brevity
@@ -64,19 +63,31 @@ def analyze_tickers_with_market_data(tickers):
 
     return consistency_score, ticker_analysis
 
-def run_consistency_analysis(twitter_api, user_id):
-    # Step 1: Fetch user tweets
-    tweets = fetch_user_tweets(twitter_api, user_id)
+def run_consistency_analysis(username, twitter_api=None):
+    twitter_api = twitter_api or GatewayProxy(PRIORITY_REPLY)
+
+    # Step 1: Index tweets posted since the last analysis of this user
+    refresh_user_index(twitter_api, username)
 
-    # Step 2: Extract tickers from tweets
-    ticker_pattern = r'\$[A-Za-z0-9]+'  # Regex for finding tickers
-    tickers = [ticker for tweet in tweets for ticker in re.findall(ticker_pattern, tweet)]
+    # Step 2: Read the user's ticker counts straight from the index
+    tickers = get_ticker_counts(username)
 
     # Step 3: Analyze ticker mentions and get market data
     consistency_score, ticker_analysis = analyze_tickers_with_market_data(tickers)
 
-    # Step 4: Construct the response with analysis results
-    reply_text = f"Consistency Score: {consistency_score:.2f}\nTop Tickers:\n"
+    # Step 4: Score the dated mention history (recency-decayed, weighted by the market data cached in step 3)
+    score = score_users(get_mention_history([username]), get_many_ticker_data(tickers))[0]
+
+    # Step 5: Construct the response with analysis results
+    reply_text = (
+        f"Consistency Score: {consistency_score:.2f} "
+        f"(recent: {score['decayed_consistency']:.2f}, conviction: {score['weighted_score']:.2f})\n"
+    )
+    top_ticker = score["top_ticker"]
+    change = price_change_since_first_mention(username, top_ticker) if top_ticker else None
+    if change:
+        reply_text += f"{top_ticker} since first mention: {change[2]:+.1f}%\n"
+    reply_text += "Top Tickers:\n"
     for ticker, details in ticker_analysis.items():
         reply_text += f"{ticker}: {details['mentions']} mentions\n"
         for idx, entry in enumerate(details["entries"][:3], start=1):
@@ -88,15 +99,45 @@ def run_consistency_analysis(twitter_api, user_id):
 
     return reply_text[:280]  # Truncate to 280 characters for Twitter
 
-def extract_tickers(tweets):
+def rank_influencers(usernames, twitter_api=None, with_market_data=True):
+    """
+    Refresh each user's ticker index and score them all in one batch.
+    Market data for every ticker involved is fetched concurrently (and cached) once.
     """
-    Extracts ticker symbols from a list of tweet texts using regex.
+    twitter_api = twitter_api or GatewayProxy(PRIORITY_REPLY)
+    for username in usernames:
+        try:
+            refresh_user_index(twitter_api, username)
+        except Exception as e:
+            logging.error(f"[SCORING] Could not refresh the ticker index for @{username}: {e}")
+    histories = get_mention_history(usernames)
+    market_data = None
+    if with_market_data:
+        market_data = get_many_ticker_data({ticker for history in histories.values() for ticker, _ in history})
+    return score_users(histories, market_data)
+
+def log_influencer_rankings(usernames=INFLUENCER_USERNAMES):
+    """Scheduled job: rank the tracked influencers (behind mention replies) and log the leaderboard."""
+    rankings = rank_influencers(usernames, GatewayProxy(PRIORITY_BACKGROUND))
+    for rank, score in enumerate(rankings, start=1):
+        logging.info(
+            f"[SCORING] #{rank} @{score['username']}: conviction {score['weighted_score']:.2f}, "
+            f"recent {score['decayed_consistency']:.2f}, top {score['top_ticker']} ({score['mentions']} mentions)"
+        )
+    return rankings
+
+def price_change_since_first_mention(username, ticker):
     """
-    import re
-    ticker_pattern = re.compile(r'\$[A-Za-z0-9]+')
-    tickers = []
-    for tweet in tweets:
-        found_tickers = ticker_pattern.findall(tweet)
-        tickers.extend(found_tickers)
-    return tickers
+    Price change of a ticker since the user first mentioned it, answered from stored
+    Dexscreener snapshots. Returns (first_price, latest_price, change_pct) or None.
+    """
+    first_mention = get_first_mention(username, ticker)
+    if first_mention is None:
+        return None
+    return price_change_since(ticker.upper(), first_mention)
 
+def extract_tickers(tweets):
+    """
+    Extracts normalized ticker symbols from a list of tweets or tweet texts.
+    """
+    return list(iter_tickers(tweets))
@@ -0,0 +1,80 @@
+# dex/market_data.py
+# Concurrent Dexscreener fetcher with a pooled session, a shared TTL cache of
+# ticker -> search response and single-flight deduplication of in-progress requests.
+# Every response is also appended to the dex_snapshots table, and a fresh stored snapshot
+# is served from disk (e.g. after a restart) before any network request is made.
+
+import threading
+import requests
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from config.config import DEXSCREENER_SEARCH_URL, DEX_CACHE_TTL, DEX_CACHE_MAX_SIZE, DEX_FETCH_WORKERS, DEX_REQUEST_TIMEOUT, DEX_SNAPSHOT_MAX_AGE
+from dex.snapshot_store import store_snapshots, get_recent_snapshot
+from utils.clients import get_http_session
+from utils.user_cache import TTLCache
+
+ticker_cache = TTLCache(max_size=DEX_CACHE_MAX_SIZE, ttl=DEX_CACHE_TTL)
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=DEX_FETCH_WORKERS, thread_name_prefix="dexscreener")
+
+
+def _request_ticker_data(ticker):
+    """Query the Dexscreener search API for a ticker over the pooled session."""
+    try:
+        response = get_http_session("dexscreener").get(DEXSCREENER_SEARCH_URL, params={"q": ticker},
+                                                      timeout=DEX_REQUEST_TIMEOUT)
+        if response.status_code == 200:
+            return response.json()
+        logging.error(f"Failed to fetch data for ticker {ticker} from Dexscreener: Status {response.status_code}")
+    except requests.RequestException as e:
+        logging.error(f"Exception occurred while fetching data for ticker {ticker}: {e}")
+    return None
+
+
+def _fetch(ticker, future):
+    try:
+        data = _request_ticker_data(ticker)
+        if data is not None:
+            ticker_cache.set(ticker, data)
+            store_snapshots(ticker, data)
+        future.set_result(data)
+    except Exception as e:
+        future.set_exception(e)
+    finally:
+        with _in_flight_lock:
+            _in_flight.pop(ticker, None)
+
+
+def submit_ticker_data(ticker):
+    """
+    Return a Future of a ticker's Dexscreener data: resolved immediately from the cache or a
+    fresh stored snapshot, shared with a request already in flight, or backed by a new request.
+    """
+    ticker = ticker.upper()
+    data = ticker_cache.get(ticker)
+    if data is None:
+        data = get_recent_snapshot(ticker, DEX_SNAPSHOT_MAX_AGE)
+        if data is not None:
+            ticker_cache.set(ticker, data)
+    if data is not None:
+        future = Future()
+        future.set_result(data)
+        return future
+    with _in_flight_lock:
+        future = _in_flight.get(ticker)
+        if future is None:
+            future = _in_flight[ticker] = Future()
+            _executor.submit(_fetch, ticker, future)
+    return future
+
+
+def get_ticker_data(ticker):
+    """Fetch one ticker's Dexscreener data (cached, single-flight)."""
+    return submit_ticker_data(ticker).result()
+
+
+def get_many_ticker_data(tickers):
+    """Fetch several tickers concurrently; returns {ticker: data or None}, in about the time of the slowest request."""
+    futures = {ticker: submit_ticker_data(ticker) for ticker in dict.fromkeys(tickers)}
+    return {ticker: future.result() for ticker, future in futures.items()}
@@ -0,0 +1,126 @@
+# dex/scoring.py
+# NumPy scoring engine for #pigID consistency. Per-user ticker histories are packed into
+# flat arrays (user index, ticker index, timestamp) so every tracked user is scored in
+# one vectorized pass: time-decayed mention weights, rolling-window consistency and a
+# liquidity / market-cap weighted conviction score.
+
+import time
+import numpy as np
+from config.config import SCORE_HALF_LIFE_DAYS, SCORE_WINDOW_DAYS, SCORE_WINDOWS
+from config.config import SCORE_LIQUIDITY_REFERENCE, SCORE_MARKET_CAP_REFERENCE
+
+DAY = 24 * 60 * 60
+
+
+def pack_histories(histories):
+    """
+    Pack {username: [(ticker, mentioned_at), ...]} into arrays.
+    Returns (usernames, tickers, user_idx, ticker_idx, timestamps).
+    """
+    usernames = list(histories)
+    ticker_ids = {}
+    user_idx, ticker_idx, timestamps = [], [], []
+    for u, username in enumerate(usernames):
+        history = histories[username]
+        user_idx.append(np.full(len(history), u, np.intp))
+        ticker_idx.extend(ticker_ids.setdefault(ticker, len(ticker_ids)) for ticker, _ in history)
+        timestamps.extend(ts for _, ts in history)
+    user_idx = np.concatenate(user_idx) if user_idx else np.empty(0, np.intp)
+    return usernames, list(ticker_ids), user_idx, np.asarray(ticker_idx, np.intp), np.asarray(timestamps, float)
+
+
+def mention_matrix(user_idx, ticker_idx, weights, shape):
+    """Sum mention weights into a users x tickers matrix."""
+    flat = np.ravel_multi_index((user_idx, ticker_idx), shape)
+    weights = np.broadcast_to(weights, flat.shape)
+    return np.bincount(flat, weights, minlength=shape[0] * shape[1]).reshape(shape)
+
+
+def decay_weights(timestamps, now, half_life_days=SCORE_HALF_LIFE_DAYS):
+    """Exponential time decay: a mention half_life_days old counts half as much as one made now."""
+    age_days = np.maximum(now - timestamps, 0) / DAY
+    return np.exp2(-age_days / half_life_days)
+
+
+def consistency(matrix):
+    """Row-wise share of the most mentioned ticker (max / sum); 0 for users with no mentions."""
+    totals = matrix.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scores = matrix.max(axis=1, initial=0) / totals
+    return np.nan_to_num(scores)
+
+
+def rolling_consistency(user_idx, ticker_idx, timestamps, shape, now,
+                        window_days=SCORE_WINDOW_DAYS, windows=SCORE_WINDOWS):
+    """
+    Consistency in each of the trailing windows, averaged over the windows a user was active in.
+    Returns (mean_consistency, per_window) with per_window shaped users x windows, newest first.
+    """
+    window = ((now - timestamps) // (window_days * DAY)).astype(np.intp)
+    in_range = (window >= 0) & (window < windows)
+    flat = np.ravel_multi_index((window[in_range], user_idx[in_range], ticker_idx[in_range]), (windows,) + shape)
+    counts = np.bincount(flat, minlength=windows * shape[0] * shape[1]).reshape((windows,) + shape)
+
+    totals = counts.sum(axis=2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        per_window = np.nan_to_num(counts.max(axis=2, initial=0) / totals).T
+    active = (totals > 0).T
+    active_windows = active.sum(axis=1)
+    mean = np.divide(per_window.sum(axis=1), active_windows, out=np.zeros(shape[0]), where=active_windows > 0)
+    return mean, per_window
+
+
+def market_weights(tickers, market_data, references=(SCORE_LIQUIDITY_REFERENCE, SCORE_MARKET_CAP_REFERENCE)):
+    """
+    Per-ticker quality weight in [0, 1] from the top Dexscreener pair: the mean of log-scaled
+    liquidity and market cap, each relative to a fixed reference size and capped at 1, so a
+    ticker's weight does not depend on which other tickers are scored alongside it.
+    """
+    liquidity = np.zeros(len(tickers))
+    market_cap = np.zeros(len(tickers))
+    for i, ticker in enumerate(tickers):
+        pairs = (market_data.get(ticker) or {}).get("pairs") or []
+        if pairs:
+            liquidity[i] = (pairs[0].get("liquidity") or {}).get("usd") or 0
+            market_cap[i] = pairs[0].get("marketCap") or 0
+    scaled = np.log1p(np.vstack([liquidity, market_cap]))
+    scale = np.log1p(np.asarray(references, float)).reshape(-1, 1)
+    return np.clip(scaled / scale, 0, 1).mean(axis=0)
+
+
+def score_users(histories, market_data=None, now=None):
+    """
+    Score every user in {username: [(ticker, mentioned_at), ...]} in one batch.
+    Returns one dict per user, ranked by weighted_score (then decayed consistency).
+    """
+    now = time.time() if now is None else now
+    usernames, tickers, user_idx, ticker_idx, timestamps = pack_histories(histories)
+    shape = (len(usernames), len(tickers))
+
+    raw = mention_matrix(user_idx, ticker_idx, 1.0, shape)
+    decayed = mention_matrix(user_idx, ticker_idx, decay_weights(timestamps, now), shape)
+    raw_consistency = consistency(raw)
+    decayed_consistency = consistency(decayed)
+    rolling, _ = rolling_consistency(user_idx, ticker_idx, timestamps, shape, now)
+
+    # Conviction: decayed consistency scaled by how liquid / large the user's tickers are
+    quality = market_weights(tickers, market_data) if market_data is not None else np.ones(len(tickers))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        shares = np.nan_to_num(decayed / decayed.sum(axis=1, keepdims=True))
+    weighted = decayed_consistency * (shares @ quality)
+
+    top = decayed.argmax(axis=1) if tickers else np.zeros(len(usernames), np.intp)
+    results = [
+        {
+            "username": username,
+            "mentions": int(raw[u].sum()),
+            "top_ticker": tickers[top[u]] if raw[u].any() else None,
+            "consistency": float(raw_consistency[u]),
+            "decayed_consistency": float(decayed_consistency[u]),
+            "rolling_consistency": float(rolling[u]),
+            "weighted_score": float(weighted[u]),
+        }
+        for u, username in enumerate(usernames)
+    ]
+    results.sort(key=lambda r: (r["weighted_score"], r["decayed_consistency"]), reverse=True)
+    return results
@@ -0,0 +1,77 @@
+# dex/snapshot_store.py
+# Keeps every Dexscreener pair snapshot (price, liquidity, market cap, FDV) fetched for a ticker
+# in the dex_snapshots table. Fresh snapshots are served back in the search response shape,
+# and price history answers questions like "price change since first mention" locally.
+
+import time
+from config.config import TWEETS_DB
+from utils.db_manager import get_connection, submit_write
+
+
+def _number(value):
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def store_snapshots(ticker, data, fetched_at=None):
+    """Queue one row per pair in a Dexscreener search response as a single executemany write."""
+    fetched_at = time.time() if fetched_at is None else fetched_at
+    rows = [
+        (ticker, fetched_at, rank, pair.get("chainId"), pair.get("pairAddress"), _number(pair.get("priceUsd")),
+         _number((pair.get("liquidity") or {}).get("usd")), _number(pair.get("marketCap")), _number(pair.get("fdv")))
+        for rank, pair in enumerate(data.get("pairs") or [])
+    ]
+    if not rows:
+        return None
+    return submit_write(TWEETS_DB, """
+        INSERT INTO dex_snapshots (ticker, fetched_at, rank, chain_id, pair_address, price_usd, liquidity_usd, market_cap, fdv)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, rows, many=True)
+
+
+def get_recent_snapshot(ticker, max_age):
+    """
+    Return the latest stored fetch of a ticker, rebuilt in the Dexscreener response shape,
+    if it is at most max_age seconds old; otherwise None.
+    """
+    rows = get_connection(TWEETS_DB).execute("""
+        SELECT chain_id, pair_address, price_usd, liquidity_usd, market_cap, fdv FROM dex_snapshots
+        WHERE ticker = ? AND fetched_at = (SELECT MAX(fetched_at) FROM dex_snapshots WHERE ticker = ?)
+          AND fetched_at >= ?
+        ORDER BY rank
+    """, (ticker, ticker, time.time() - max_age)).fetchall()
+    if not rows:
+        return None
+    return {"pairs": [
+        {"chainId": chain_id, "pairAddress": pair_address,
+         "priceUsd": str(price) if price is not None else None,
+         "liquidity": {"usd": liquidity} if liquidity is not None else {}, "marketCap": market_cap, "fdv": fdv}
+        for chain_id, pair_address, price, liquidity, market_cap, fdv in rows
+    ]}
+
+
+def price_change_since(ticker, since):
+    """
+    Price change of a ticker's current top pair between `since` and the latest snapshot. The price
+    at `since` is the last snapshot at or before it; a later snapshot would misstate the change.
+    Returns (first_price, latest_price, change_pct), or None when no snapshot is that old.
+    """
+    conn = get_connection(TWEETS_DB)
+    top = conn.execute("""
+        SELECT pair_address FROM dex_snapshots WHERE ticker = ? AND rank = 0
+        ORDER BY fetched_at DESC LIMIT 1
+    """, (ticker,)).fetchone()
+    if not top or not top[0]:
+        return None
+    first = conn.execute("""
+        SELECT price_usd FROM dex_snapshots
+        WHERE pair_address = ? AND fetched_at <= ? AND price_usd IS NOT NULL ORDER BY fetched_at DESC LIMIT 1
+    """, (top[0], since)).fetchone()
+    latest = conn.execute("""
+        SELECT price_usd FROM dex_snapshots WHERE pair_address = ? AND price_usd IS NOT NULL ORDER BY fetched_at DESC LIMIT 1
+    """, (top[0],)).fetchone()
+    if not first or not first[0]:
+        return None
+    return first[0], latest[0], (latest[0] - first[0]) / first[0] * 100
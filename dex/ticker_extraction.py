@@ -0,0 +1,41 @@
+# dex/ticker_extraction.py
+# Ticker ($CASHTAG) extraction shared by ingestion, the #pigID index and dex analysis.
+# Cashtag entities returned by the API are preferred; tweet text is only scanned when
+# the tweet carries no entities. Symbols are normalized to upper case with a leading "$".
+
+import re
+
+# Single compiled scanner: a "$" not preceded by a word character or another "$",
+# followed by a symbol that starts with a letter (so "$100" is not a ticker).
+# The lookbehind sits after the literal "$" so the engine only evaluates it at candidate positions.
+TICKER_SCANNER = re.compile(r'\$(?<![\w$]\$)([A-Za-z][A-Za-z0-9_]*)')
+
+
+def normalize_ticker(symbol):
+    """Return the canonical form of a ticker symbol, e.g. 'pig' or '$pig' -> '$PIG'."""
+    return "$" + symbol.lstrip("$").upper()
+
+
+def tickers_in_text(text):
+    """Scan raw text for tickers and return the normalized symbols in order of appearance."""
+    return ["$" + symbol.upper() for symbol in TICKER_SCANNER.findall(text or "")]
+
+
+def tickers_in_tweet(tweet):
+    """
+    Return the normalized tickers of a tweet, one per occurrence.
+    Accepts a plain string, a dict or a tweepy Tweet; cashtag entities are used when present.
+    """
+    if isinstance(tweet, str):
+        return tickers_in_text(tweet)
+
+    entities = tweet.get("entities")
+    if entities is not None:
+        return [normalize_ticker(cashtag["tag"]) for cashtag in entities.get("cashtags", ())]
+    return tickers_in_text(tweet.get("text") or tweet.get("tweet_text"))
+
+
+def iter_tickers(tweets):
+    """Lazily yield normalized tickers from a stream of tweets."""
+    for tweet in tweets:
+        yield from tickers_in_tweet(tweet)
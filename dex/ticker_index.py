@@ -0,0 +1,102 @@
+# dex/ticker_index.py
+# Incremental per-user ticker mention index for #pigID consistency analysis.
+# Counts live in the ticker_mentions table; the newest processed tweet ID per user
+# is kept as a since_id cursor, so each refresh only fetches and scans new tweets.
+# Each (tweet, ticker) pair is also kept with its timestamp in ticker_mention_history
+# for the time-aware scoring in dex/scoring.py. Both count a ticker once per tweet, so
+# the headline consistency and the scored "recent" consistency use the same rule.
+
+import time
+import logging
+from collections import Counter
+from config.config import TWEETS_DB
+from dex.ticker_extraction import tickers_in_tweet
+from utils.db import get_cursor, set_cursor
+from utils.db_manager import get_connection
+from utils.twitter_utils import fetch_user_tweets_since
+from utils.user_cache import resolve_user_ids
+
+
+def _cursor_name(username):
+    return f"ticker_index:{username.lower()}"
+
+
+def _mentioned_at(tweet):
+    # tweet.created_at is the parsed datetime (the mapping holds the raw ISO string)
+    created_at = getattr(tweet, "created_at", None)
+    return created_at.timestamp() if created_at else time.time()
+
+
+def refresh_user_index(twitter_api, username):
+    """Fetch the user's tweets since the last refresh and add their ticker mentions to the index."""
+    user_id = resolve_user_ids(twitter_api, [username]).get(username)
+    if user_id is None:
+        raise ValueError(f"Unknown Twitter user @{username}")
+
+    name = username.lower()
+    cursor_name = _cursor_name(username)
+    since_id = get_cursor(cursor_name)
+    tweets = fetch_user_tweets_since(twitter_api, user_id, since_id, tweet_fields=["entities", "created_at"])
+    if not tweets:
+        return 0
+
+    counts = Counter()
+    conn = get_connection(TWEETS_DB)
+    # Two #pigID analyses of the same user can refresh at once from the same cursor. Writing under
+    # BEGIN IMMEDIATE serializes them, and a tweet's tickers are only counted when its history row
+    # is new, so tweets the other refresh already indexed are never counted twice.
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for tweet in tweets:
+            mentioned_at = _mentioned_at(tweet)
+            for ticker in set(tickers_in_tweet(tweet)):
+                inserted = conn.execute("""
+                    INSERT OR IGNORE INTO ticker_mention_history (username, tweet_id, ticker, mentioned_at) VALUES (?, ?, ?, ?)
+                """, (name, str(tweet.id), ticker, mentioned_at)).rowcount
+                counts[ticker] += inserted
+        conn.executemany("""
+            INSERT INTO ticker_mentions (username, ticker, count) VALUES (?, ?, ?)
+            ON CONFLICT(username, ticker) DO UPDATE SET count = count + excluded.count
+        """, [(name, ticker, count) for ticker, count in counts.items()])
+        # Re-read inside the transaction so a concurrent refresh's newer cursor is never moved back;
+        # set_cursor commits on the same connection, so counts and cursor land together
+        newest = max(tweet.id for tweet in tweets)
+        set_cursor(cursor_name, max(newest, int(get_cursor(cursor_name) or 0)))
+    except Exception:
+        conn.rollback()
+        raise
+    logging.info(f"[TICKER INDEX] Indexed {len(tweets)} new tweets for @{username} ({sum(counts.values())} new ticker mentions).")
+    return len(tweets)
+
+
+def get_ticker_counts(username):
+    """Return the indexed ticker mention counts for a user (tweets mentioning each ticker) as a Counter."""
+    rows = get_connection(TWEETS_DB).execute(
+        "SELECT ticker, count FROM ticker_mentions WHERE username = ?", (username.lower(),)
+    ).fetchall()
+    return Counter(dict(rows))
+
+
+def get_mention_history(usernames):
+    """Return {username: [(ticker, mentioned_at), ...]} from the dated mention history, oldest first."""
+    names = [username.lower() for username in usernames]
+    history = {name: [] for name in names}
+    if not names:
+        return history
+    rows = get_connection(TWEETS_DB).execute(
+        f"SELECT username, ticker, mentioned_at FROM ticker_mention_history "
+        f"WHERE username IN ({','.join('?' * len(names))}) ORDER BY mentioned_at",
+        names,
+    )
+    for username, ticker, mentioned_at in rows:
+        history[username].append((ticker, mentioned_at))
+    return history
+
+
+def get_first_mention(username, ticker):
+    """Return the timestamp of the user's first indexed mention of a ticker, or None."""
+    row = get_connection(TWEETS_DB).execute(
+        "SELECT MIN(mentioned_at) FROM ticker_mention_history WHERE username = ? AND ticker = ?",
+        (username.lower(), ticker.upper()),
+    ).fetchone()
+    return row[0]
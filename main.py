@@ -3,6 +3,7 @@ from utils.logging_config import setup_logging
 from utils.db import initialize_tweet_data
 from utils.rewards_service import shuffle_reward, distribute_rewards_for_goals
 from utils.schedule_tasks import check_engagements
+from dex.dex_analysis import log_influencer_rankings
 from utils.god_mode import generate_lore_content, generate_prayer_from_mentions, generate_transparency_content, respond_with_quote_tweet
 
 import schedule
@@ -60,8 +61,9 @@ if __name__ == "__main__":
     threading.Thread(target=run_mentions_check, args=(bot,), daemon=True).start()
 
     # Schedule engagement checks and reward distribution
-    schedule.every().hour.do(check_engagements)  # Only checks engagements and flags tweets
-    schedule.every().hour.do(distribute_rewards_for_goals)  # Handles reward distribution for flagged tweets
+    schedule.every().hour.do(check_engagements, bot)  # Only checks engagements and flags tweets
+    schedule.every().hour.do(distribute_rewards_for_goals, bot)  # Drains the durable queue of flagged tweets
+    schedule.every(8).hours.do(log_influencer_rankings)  # Ranks the tracked influencers' #pigID consistency
 
     # Main loop to run all scheduled tasks
     while True:
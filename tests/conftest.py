@@ -0,0 +1,16 @@
+# tests/conftest.py
+# Tests run offline: dummy credentials, and a throwaway working directory so the relative
+# database paths in config (pig_bot.db, engagements.db) never touch a real checkout.
+
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+for name in ("TWITTER_API_KEY", "TWITTER_API_SECRET", "TWITTER_ACCESS_TOKEN", "TWITTER_ACCESS_TOKEN_SECRET",
+             "TWITTER_BEARER_TOKEN", "OPENAI_API_KEY"):
+    os.environ.setdefault(name, "test")
+
+os.chdir(tempfile.mkdtemp(prefix="pigbot_tests_"))
@@ -0,0 +1,47 @@
+# tests/test_ingest_source.py
+# IngestSource.store writes the collected tweets and advances its cursor in one transaction.
+
+import tweepy
+import pytest
+import utils.db as db
+
+
+def timeline_tweet(tweet_id):
+    return tweepy.Tweet({"id": str(tweet_id), "text": f"oink {tweet_id} $PIG", "edit_history_tweet_ids": [str(tweet_id)],
+                         "author_id": "42", "created_at": "2026-10-01T12:00:00.000Z",
+                         "public_metrics": {"like_count": 1, "retweet_count": 0, "reply_count": 0, "quote_count": 0}})
+
+
+@pytest.fixture(autouse=True)
+def tweets_db(monkeypatch):
+    db.setup_tweet_db()
+    monkeypatch.setattr(db, "resolve_usernames", lambda client, author_ids: {author_id: "influencer" for author_id in author_ids})
+
+
+def stored(tweet_ids):
+    return db.get_connection(db.TWEETS_DB).execute(
+        f"SELECT COUNT(*) FROM tweets WHERE tweet_id IN ({','.join('?' * len(tweet_ids))})", [str(i) for i in tweet_ids]
+    ).fetchone()[0]
+
+
+def test_store_saves_tweets_and_advances_the_cursor():
+    source = db.IngestSource("ingest:@stored", "influencer", "get_users_tweets", {"id": 42}, "pagination_token")
+    source.tweets = [timeline_tweet(101), timeline_tweet(103), timeline_tweet(102)]
+
+    assert source.store() == 3
+    assert stored([101, 102, 103]) == 3
+    assert db.get_cursor("ingest:@stored") == "103"
+
+
+def test_failed_store_leaves_neither_tweets_nor_cursor(monkeypatch):
+    def broken_samples(conn, category, rows):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(db, "add_samples", broken_samples)
+    source = db.IngestSource("ingest:@broken", "influencer", "get_users_tweets", {"id": 42}, "pagination_token")
+    source.tweets = [timeline_tweet(201), timeline_tweet(202)]
+
+    with pytest.raises(RuntimeError):
+        source.store()
+    assert stored([201, 202]) == 0
+    assert db.get_cursor("ingest:@broken") is None
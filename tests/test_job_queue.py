@@ -0,0 +1,64 @@
+# tests/test_job_queue.py
+# Leases, expiry and the attempt limit of utils.job_queue.JobQueue.
+
+import time
+import pytest
+from utils.db import setup_engagement_inventory_db
+from utils.job_queue import JobQueue
+
+
+@pytest.fixture(autouse=True)
+def engagements_db():
+    setup_engagement_inventory_db()
+
+
+def job_row(queue, key):
+    return queue.conn.execute(
+        "SELECT status, attempts, lease_owner FROM jobs WHERE queue = ? AND job_key = ?", (queue.name, key)
+    ).fetchone()
+
+
+def test_expired_lease_is_handed_to_another_worker():
+    queue = JobQueue("test-expiry", lease_seconds=0.05, max_attempts=3)
+    assert queue.enqueue("tweet-1", payload="Bacon")
+    assert not queue.enqueue("tweet-1")
+
+    first = queue.lease("worker-a")
+    assert (first.key, first.payload, first.attempts) == ("tweet-1", "Bacon", 1)
+    assert queue.lease("worker-b") is None  # Still leased to worker-a
+
+    time.sleep(0.1)
+    second = queue.lease("worker-b")
+    assert second.attempts == 2
+    assert not queue.complete(first, "worker-a")  # worker-a lost its lease
+    assert queue.complete(second, "worker-b")
+    assert job_row(queue, "tweet-1")[0] == "done"
+
+
+def test_lease_expiring_on_the_final_attempt_marks_the_job_failed():
+    queue = JobQueue("test-max-attempts", lease_seconds=0.05, max_attempts=2)
+    queue.enqueue("tweet-2")
+
+    assert queue.lease("worker-a").attempts == 1
+    time.sleep(0.1)
+    assert queue.lease("worker-b").attempts == 2
+    time.sleep(0.1)  # worker-b crashes too, holding the last allowed attempt
+
+    assert queue.lease("worker-c") is None
+    assert job_row(queue, "tweet-2") == ("failed", 2, None)
+
+
+def test_failed_attempts_back_off_then_park_as_failed():
+    queue = JobQueue("test-fail", max_attempts=2)
+    queue.enqueue("tweet-3")
+
+    job = queue.lease("worker-a")
+    queue.fail(job, "worker-a", RuntimeError("boom"))
+    assert job_row(queue, "tweet-3")[0] == "pending"
+    assert queue.lease("worker-a") is None  # Backing off
+
+    queue.conn.execute("UPDATE jobs SET available_at = 0 WHERE queue = ?", (queue.name,))
+    queue.conn.commit()
+    job = queue.lease("worker-a")
+    queue.fail(job, "worker-a", RuntimeError("boom again"))
+    assert job_row(queue, "tweet-3")[0] == "failed"
@@ -0,0 +1,52 @@
+# tests/test_llm_service.py
+# Per-item fallback of utils.llm_service.generate_batch when the batch reply is unusable.
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from utils import llm_service
+from utils.llm_backends import LLMBackend
+
+FALLBACK_LATENCY = 0.3
+
+
+class GarbledBatchBackend(LLMBackend):
+    """Answers single inputs after a delay and every batch request with prose instead of JSON."""
+
+    name = "garbled"
+
+    def complete(self, messages):
+        text = messages[-1].content
+        if text.startswith("["):
+            return "The spirit of $PIG refuses to speak in JSON today."
+        time.sleep(FALLBACK_LATENCY)
+        return f"oink: {text}"
+
+
+@pytest.fixture(autouse=True)
+def garbled_backend():
+    llm_service.set_backend(GarbledBatchBackend())
+    yield
+    llm_service.set_backend(None)
+
+
+TEXTS = {i: f"mention {i}" for i in range(1, 5)}
+
+
+def test_fallbacks_run_in_parallel_on_the_executor():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        start = time.monotonic()
+        replies = llm_service.generate_batch("mention", TEXTS, use_cache=False, executor=executor)
+        elapsed = time.monotonic() - start
+
+    assert replies == {i: f"oink: mention {i}" for i in TEXTS}
+    assert elapsed < 2 * FALLBACK_LATENCY
+
+
+def test_batch_running_on_a_saturated_executor_still_completes():
+    # The batch call occupies the only worker, so its queued fallbacks are run by the call itself
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(llm_service.generate_batch, "mention", TEXTS, None, False, executor)
+        replies = future.result(timeout=len(TEXTS) * FALLBACK_LATENCY + 2)
+
+    assert replies == {i: f"oink: mention {i}" for i in TEXTS}
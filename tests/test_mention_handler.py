@@ -0,0 +1,41 @@
+# tests/test_mention_handler.py
+# #pigID target selection in bot.mention_handler.compose_reply.
+
+import tweepy
+import pytest
+import bot.mention_handler as mention_handler
+
+BOT_ID = 999
+
+
+def pigid_mention(text, tagged):
+    mentions = [{"start": 0, "end": len(name) + 1, "username": name, "id": str(user_id)} for name, user_id in tagged]
+    return tweepy.Tweet({"id": "1", "text": text, "edit_history_tweet_ids": ["1"], "author_id": "7",
+                         "entities": {"mentions": mentions, "hashtags": [{"tag": "pigID"}]}})
+
+
+@pytest.fixture
+def analyzed(monkeypatch):
+    targets = []
+    monkeypatch.setattr(mention_handler, "get_bot_user_id", lambda: BOT_ID)
+    monkeypatch.setattr(mention_handler, "run_consistency_analysis", lambda target: targets.append(target) or f"analysis of @{target}")
+    return targets
+
+
+def test_pigid_analyzes_the_tagged_user_not_the_bot(analyzed):
+    mention = pigid_mention("@pig #pigID @someone", [("pig", BOT_ID), ("someone", 5)])
+
+    reply_text, award = mention_handler.compose_reply(mention, "alice", mention.text)
+
+    assert analyzed == ["someone"]
+    assert reply_text == "analysis of @someone"
+    assert award is False
+
+
+def test_pigid_skips_the_author_and_asks_for_a_target(analyzed):
+    mention = pigid_mention("@pig #pigID @Alice", [("pig", BOT_ID), ("Alice", 7)])
+
+    reply_text, _ = mention_handler.compose_reply(mention, "alice", mention.text)
+
+    assert analyzed == []
+    assert reply_text == "@alice, please tag a user after #pigID to analyze."
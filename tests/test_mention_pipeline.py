@@ -0,0 +1,92 @@
+# tests/test_mention_pipeline.py
+# Exactly-once claim / release and draining of bot.mention_pipeline.MentionPipeline.
+
+import threading
+import tweepy
+import pytest
+import bot.mention_pipeline as mention_pipeline
+from bot.mention_pipeline import MentionPipeline
+
+
+def make_mention(tweet_id, text="@pigbot oink"):
+    return tweepy.Tweet({"id": str(tweet_id), "text": text, "edit_history_tweet_ids": [str(tweet_id)], "author_id": "7"})
+
+
+class FakeBot:
+    def __init__(self, fail_mark=()):
+        self.twitter_api_v2 = None
+        self.replied = set()
+        self.marked = []
+        self.fail_mark = set(fail_mark)
+        self._lock = threading.Lock()
+
+    def has_replied(self, tweet_id):
+        return tweet_id in self.replied
+
+    def mark_replied(self, tweet_id):
+        with self._lock:
+            self.marked.append(tweet_id)
+        if tweet_id in self.fail_mark:
+            raise RuntimeError("database is locked")
+        self.replied.add(tweet_id)
+
+    def get_username_by_author_id(self, author_id):
+        return "someone"
+
+
+@pytest.fixture
+def posted(monkeypatch):
+    """Stub the stages around the pipeline: odd-numbered batches fail to generate, id 5 fails to post."""
+    posts = []
+    lock = threading.Lock()
+
+    def generate_responses(tweet_texts, executor=None):
+        if min(tweet_texts) % 2:
+            raise RuntimeError("LLM down")
+        return {mention_id: "oink" for mention_id in tweet_texts}
+
+    def post_reply(mention, twitter_api_v2, username, reply_text, award, current_reward):
+        if mention.id == 5:
+            raise RuntimeError("403 Forbidden")
+        with lock:
+            posts.append(mention.id)
+
+    monkeypatch.setattr(mention_pipeline, "enrich_mention", lambda mention, api: mention.text)
+    monkeypatch.setattr(mention_pipeline, "generate_responses", generate_responses)
+    monkeypatch.setattr(mention_pipeline, "post_reply", post_reply)
+    return posts
+
+
+def test_duplicates_are_posted_at_most_once_and_every_mention_is_released(posted):
+    bot = FakeBot()
+    mentions = [make_mention(i) for i in range(1, 11)]
+    pipeline = MentionPipeline(bot, batch_size=1)
+
+    jobs = pipeline.run(mentions + mentions[:5])
+
+    assert len(jobs) == 10
+    assert len(posted) == len(set(posted))
+    assert set(posted) == {i for i in range(2, 11, 2)}
+    assert sorted(bot.marked) == list(range(1, 11))
+    assert not pipeline._in_flight
+    # Failed mentions carry their error; a second sweep claims nothing
+    assert {job.mention.id for job in jobs if job.error is not None} == {1, 3, 5, 7, 9}
+    assert pipeline.run(mentions) == []
+    assert len(posted) == 5
+
+
+def test_sweep_drains_when_recording_a_reply_fails(posted):
+    bot = FakeBot(fail_mark={2, 4})
+    pipeline = MentionPipeline(bot, batch_size=4)
+    done = threading.Event()
+    result = []
+
+    def run():
+        result.extend(pipeline.run([make_mention(i) for i in range(1, 9)]))
+        done.set()
+
+    threading.Thread(target=run, daemon=True).start()
+    assert done.wait(10), "run() never drained"
+    assert len(result) == 8
+    assert sorted(bot.marked) == list(range(1, 9))
+    assert not pipeline._in_flight
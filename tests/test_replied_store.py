@@ -0,0 +1,20 @@
+# tests/test_replied_store.py
+# Legacy replied_mentions.txt import in utils.replied_store.
+
+from utils.replied_store import RepliedStore
+
+
+def test_import_leaves_the_file_in_place_and_runs_once(tmp_path):
+    legacy = tmp_path / "replied_mentions.txt"
+    legacy.write_text("101\n102\n\n103\n")
+    store = RepliedStore()
+
+    assert store.import_file(str(legacy)) == 3
+    assert legacy.exists()
+    assert all(store.has_replied(mention_id) for mention_id in (101, 102, 103))
+    assert store.import_file(str(legacy)) == 0
+
+    # A changed file is imported again; IDs already stored are ignored
+    legacy.write_text("101\n102\n103\n104\n")
+    assert store.import_file(str(legacy)) == 4
+    assert store.has_replied(104)
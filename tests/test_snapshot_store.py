@@ -0,0 +1,30 @@
+# tests/test_snapshot_store.py
+# Price change lookups in dex.snapshot_store answered from stored Dexscreener snapshots.
+
+import pytest
+from dex.snapshot_store import store_snapshots, price_change_since
+from utils.db import setup_tweet_db
+from utils.db_manager import flush_all
+
+
+def search_response(price):
+    return {"pairs": [{"chainId": "solana", "pairAddress": "pig-pair", "priceUsd": str(price),
+                       "liquidity": {"usd": 50000}, "marketCap": 1000000, "fdv": 1000000}]}
+
+
+@pytest.fixture(autouse=True)
+def snapshots():
+    setup_tweet_db()
+    for fetched_at, price in [(1000, 1.0), (2000, 2.0), (3000, 3.0)]:
+        store_snapshots("$PIG", search_response(price), fetched_at=fetched_at)
+    flush_all()
+
+
+def test_change_is_measured_from_the_last_snapshot_before_the_mention():
+    assert price_change_since("$PIG", 2500) == (2.0, 3.0, 50.0)
+    assert price_change_since("$PIG", 1000) == (1.0, 3.0, 200.0)
+
+
+def test_no_change_without_a_snapshot_from_before_the_mention():
+    assert price_change_since("$PIG", 999) is None
+    assert price_change_since("$NOPE", 5000) is None
@@ -0,0 +1,43 @@
+# tests/test_ticker_index.py
+# The per-user ticker index counts each ticker once per tweet, matching the dated history.
+
+import tweepy
+import pytest
+import dex.ticker_index as ticker_index
+from utils.db import setup_tweet_db
+
+
+def cashtag_tweet(tweet_id, *tags):
+    return tweepy.Tweet({"id": str(tweet_id), "text": " ".join(f"${tag}" for tag in tags),
+                         "edit_history_tweet_ids": [str(tweet_id)], "created_at": "2026-10-01T12:00:00.000Z",
+                         "entities": {"cashtags": [{"tag": tag} for tag in tags]}})
+
+
+@pytest.fixture
+def fetched(monkeypatch):
+    setup_tweet_db()
+    tweets = []
+    monkeypatch.setattr(ticker_index, "resolve_user_ids", lambda api, usernames: {name: 1 for name in usernames})
+    monkeypatch.setattr(ticker_index, "fetch_user_tweets_since", lambda api, user_id, since_id, tweet_fields: list(tweets))
+    return tweets
+
+
+def test_repeated_ticker_in_one_tweet_counts_once(fetched):
+    fetched.extend([cashtag_tweet(11, "PIG", "PIG", "PIG"), cashtag_tweet(12, "PIG", "WIF"), cashtag_tweet(13, "WIF")])
+
+    assert ticker_index.refresh_user_index(None, "Counter") == 3
+
+    counts = ticker_index.get_ticker_counts("counter")
+    history = ticker_index.get_mention_history(["counter"])["counter"]
+    assert counts == {"$PIG": 2, "$WIF": 2}
+    assert sorted(ticker for ticker, _ in history) == ["$PIG", "$PIG", "$WIF", "$WIF"]
+
+
+def test_refetched_tweets_are_not_counted_again(fetched):
+    fetched.append(cashtag_tweet(21, "BONK", "BONK"))
+    ticker_index.refresh_user_index(None, "refetch")
+    # A concurrent refresh from the same cursor sees the same tweet plus a new one
+    fetched.append(cashtag_tweet(22, "BONK"))
+    ticker_index.refresh_user_index(None, "refetch")
+
+    assert ticker_index.get_ticker_counts("refetch") == {"$BONK": 2}
@@ -0,0 +1,136 @@
+# tests/test_twitter_gateway.py
+# Behaviour of utils.twitter_gateway.TwitterGateway with a fake client: header-seeded token
+# buckets, parking and resuming after a 429, the retry limit and priority ordering.
+
+import threading
+import time
+import pytest
+import requests
+import tweepy
+from utils.twitter_gateway import TwitterGateway, TokenBucket, PRIORITY_REPLY, PRIORITY_BACKGROUND
+
+
+class FakeClient:
+    """Stands in for tweepy.Client / API; methods are attached per test."""
+
+
+def make_gateway(workers=2, max_retries=3, **methods):
+    client = FakeClient()
+    for name, fn in methods.items():
+        setattr(client, name, fn)
+    return TwitterGateway(client=client, api_v1=FakeClient(), session=requests.Session(),
+                          workers=workers, max_retries=max_retries)
+
+
+def rate_limit_headers(limit, remaining, reset_in):
+    return {"x-rate-limit-limit": str(limit), "x-rate-limit-remaining": str(remaining),
+            "x-rate-limit-reset": str(time.time() + reset_in)}
+
+
+def too_many_requests(reset_in):
+    response = requests.Response()
+    response.status_code = 429
+    response.reason = "Too Many Requests"
+    response.headers.update(rate_limit_headers(10, 0, reset_in))
+    response._content = b"{}"
+    return tweepy.TooManyRequests(response)
+
+
+def test_bucket_is_unbounded_until_seeded_from_headers():
+    bucket = TokenBucket()
+    assert all(bucket.try_acquire() == 0 for _ in range(100))
+
+    bucket.update(rate_limit_headers(limit=5, remaining=2, reset_in=30))
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 0
+    assert 25 < bucket.try_acquire() <= 30
+
+    # Malformed headers leave the bucket as it was
+    bucket.update({"x-rate-limit-limit": "oops"})
+    assert bucket.try_acquire() > 0
+
+
+def test_exhausted_endpoint_parks_calls_until_its_window_resets():
+    gateway = make_gateway(get_me=lambda: "me")
+    gateway.observe("get_me", rate_limit_headers(limit=1, remaining=1, reset_in=1))
+
+    first = gateway.submit("get_me")
+    second = gateway.submit("get_me")
+    assert first.result(timeout=2) == "me"
+    with pytest.raises(TimeoutError):
+        second.result(timeout=0.3)
+    # The window resets after about a second and the parked call runs with the refilled budget
+    assert second.result(timeout=3) == "me"
+
+
+def test_429_is_parked_and_retried():
+    calls = []
+
+    def get_tweet(tweet_id):
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            raise too_many_requests(reset_in=1)
+        return f"tweet {tweet_id}"
+
+    gateway = make_gateway(get_tweet=get_tweet)
+    assert gateway.call("get_tweet", 42) == "tweet 42"
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.9
+
+
+def test_429_gives_up_after_the_retry_limit():
+    calls = []
+
+    def get_tweet(tweet_id):
+        calls.append(tweet_id)
+        raise too_many_requests(reset_in=0)
+
+    gateway = make_gateway(max_retries=1, get_tweet=get_tweet)
+    with pytest.raises(tweepy.TooManyRequests):
+        gateway.submit("get_tweet", 42).result(timeout=5)
+    assert len(calls) == 2
+
+
+def test_reply_priority_is_served_before_background():
+    started = threading.Event()
+    release = threading.Event()
+    order = []
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    gateway = make_gateway(workers=1, block=block, work=order.append)
+    gateway.submit("block")
+    assert started.wait(2)
+
+    # The only worker is busy, so everything below queues up behind it
+    futures = [gateway.submit("work", f"background {i}", priority=PRIORITY_BACKGROUND) for i in range(3)]
+    futures.append(gateway.submit("work", "reply", priority=PRIORITY_REPLY))
+    release.set()
+    for future in futures:
+        future.result(timeout=2)
+    assert order == ["reply", "background 0", "background 1", "background 2"]
+
+
+def test_no_retry_calls_fail_fast_instead_of_parking():
+    calls = []
+
+    def get_liking_users(tweet_id):
+        calls.append(tweet_id)
+        raise too_many_requests(reset_in=60)
+
+    gateway = make_gateway(get_liking_users=get_liking_users, get_retweeters=lambda tweet_id: "never called")
+    background = gateway.proxy(PRIORITY_BACKGROUND, max_retries=0)
+
+    # A 429 from the API surfaces at once rather than after the window resets
+    start = time.monotonic()
+    with pytest.raises(tweepy.TooManyRequests):
+        background.get_liking_users(42)
+    assert len(calls) == 1
+
+    # So does a call to an endpoint whose budget is already known to be exhausted
+    gateway.observe("get_retweeters", rate_limit_headers(limit=75, remaining=0, reset_in=60))
+    with pytest.raises(tweepy.TooManyRequests):
+        background.get_retweeters(42)
+    assert time.monotonic() - start < 2
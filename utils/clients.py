@@ -0,0 +1,51 @@
+# utils/clients.py
+# Process-wide registry of network clients: pooled keep-alive HTTP sessions,
+# the Twitter gateway and the bot's own user ID, all created lazily on first use.
+
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from config.config import HTTP_POOL_SIZE
+from utils.logging_config import logging
+
+_lock = threading.RLock()
+_sessions = {}
+_gateway = None
+_bot_user_id = None
+
+
+def get_http_session(name="default"):
+    """Return a shared requests session with a keep-alive connection pool, one per name."""
+    session = _sessions.get(name)
+    if session is None:
+        with _lock:
+            session = _sessions.get(name)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _sessions[name] = session
+    return session
+
+
+def get_gateway():
+    """Return the process-wide Twitter gateway, creating it on first use."""
+    global _gateway
+    if _gateway is None:
+        with _lock:
+            if _gateway is None:
+                from utils.twitter_gateway import TwitterGateway
+                _gateway = TwitterGateway(session=get_http_session("twitter"))
+    return _gateway
+
+
+def get_bot_user_id():
+    """Return the bot's Twitter user ID, calling get_me only once per process."""
+    global _bot_user_id
+    if _bot_user_id is None:
+        with _lock:
+            if _bot_user_id is None:
+                _bot_user_id = get_gateway().call("get_me").data.id
+                logging.info(f"Retrieved bot's user ID: {_bot_user_id}")
+    return _bot_user_id
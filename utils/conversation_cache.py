@@ -0,0 +1,44 @@
+# utils/conversation_cache.py
+# Caches conversation root tweets across sweeps and batch-fetches uncached roots,
+# so each distinct conversation costs at most one lookup.
+
+import tweepy
+from config.config import CONVERSATION_CACHE_MAX_SIZE, CONVERSATION_CACHE_TTL
+from utils.user_cache import TTLCache
+from utils.logging_config import logging
+
+TWEETS_LOOKUP_BATCH_SIZE = 100  # Max IDs accepted by the multi-tweet lookup
+MISSING = object()  # Cached marker for roots that were deleted or are not visible
+
+conversation_roots = TTLCache(max_size=CONVERSATION_CACHE_MAX_SIZE, ttl=CONVERSATION_CACHE_TTL)
+
+
+def prefetch_conversations(client, mentions):
+    """Batch-fetch the root tweets of every uncached conversation referenced by the mentions."""
+    missing = list(dict.fromkeys(
+        str(mention.get("conversation_id")) for mention in mentions
+        if mention.get("conversation_id") and mention.get("conversation_id") != mention.id
+        and conversation_roots.get(str(mention.get("conversation_id"))) is None
+    ))
+    for start in range(0, len(missing), TWEETS_LOOKUP_BATCH_SIZE):
+        batch = missing[start:start + TWEETS_LOOKUP_BATCH_SIZE]
+        try:
+            response = client.get_tweets(ids=batch)
+        except tweepy.TweepyException as e:
+            logging.error(f"Error batch-fetching {len(batch)} conversation tweets: {e}")
+            continue
+        found = {str(tweet.id): tweet for tweet in response.data or []}
+        for conversation_id in batch:
+            conversation_roots.set(conversation_id, found.get(conversation_id, MISSING))
+    if missing:
+        logging.info(f"Prefetched {len(missing)} conversation roots for {len(mentions)} mentions.")
+
+
+def get_conversation_tweet(client, conversation_id):
+    """Return the root tweet of a conversation from the cache, fetching it if needed (None if unavailable)."""
+    conversation_id = str(conversation_id)
+    tweet = conversation_roots.get(conversation_id)
+    if tweet is None:
+        tweet = client.get_tweet(conversation_id).data or MISSING
+        conversation_roots.set(conversation_id, tweet)
+    return None if tweet is MISSING else tweet
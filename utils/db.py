@@ -1,19 +1,27 @@
-import os
+import json
 import sqlite3
-import time
 import logging
 import schedule
 import tweepy
 from datetime import datetime
+from concurrent.futures import wait, FIRST_COMPLETED
+from utils.user_cache import cache_users, resolve_usernames, resolve_user_ids
+from utils.twitter_gateway import GatewayProxy, PRIORITY_BACKGROUND
+from utils.db_manager import get_connection
+from utils.tweet_sampler import add_samples, rebuild_samples, to_timestamp
+from utils.engagement_tracker import total_engagements
+from dex.ticker_extraction import normalize_ticker, tickers_in_tweet
+from config.config import ENGAGEMENTS_DB, TWEETS_DB, INFLUENCER_USERNAMES, INGEST_HASHTAGS, INGEST_INITIAL_RESULTS, INGEST_PAGE_SIZE, INGEST_MAX_PAGES
 
-# Set up Tweepy client
-BEARER_TOKEN = os.getenv("TWITTER_BEARER_TOKEN")
-client = tweepy.Client(bearer_token=BEARER_TOKEN)
+INGEST_TWEET_FIELDS = ["created_at", "author_id", "entities", "public_metrics"]
+
+# Tweepy client routed through the shared gateway at background priority
+client = GatewayProxy(PRIORITY_BACKGROUND)
 
 # Initialize databases for engagements, inventory, tweets, and replied tweets
 def setup_engagement_inventory_db():
     """Set up the engagements and inventory tables."""
-    conn = sqlite3.connect("engagements.db")
+    conn = get_connection(ENGAGEMENTS_DB)
     cursor = conn.cursor()
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS engagements (
@@ -32,12 +40,61 @@ def setup_engagement_inventory_db():
             UNIQUE(username, item)
         )
     """)
+    # One row per (tweet, user) reward grant; makes reward distribution idempotent
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS reward_grants (
+            tweet_id TEXT NOT NULL,
+            username TEXT NOT NULL,
+            item TEXT NOT NULL,
+            quantity INTEGER NOT NULL,
+            granted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (tweet_id, username)
+        )
+    """)
+    # Durable work queue (e.g. tweets that reached their engagement target awaiting reward distribution)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            queue TEXT NOT NULL,
+            job_key TEXT NOT NULL,
+            payload TEXT,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            available_at REAL NOT NULL,
+            lease_owner TEXT,
+            lease_expires REAL,
+            last_error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            completed_at TIMESTAMP,
+            PRIMARY KEY (queue, job_key)
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs (queue, status, available_at)")
+    # Pagination progress of engager collection per tweet and source, so collection can resume
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS engager_progress (
+            tweet_id TEXT NOT NULL,
+            source TEXT NOT NULL,
+            next_token TEXT,
+            done INTEGER DEFAULT 0,
+            PRIMARY KEY (tweet_id, source)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS engagement_snapshots (
+            tweet_id TEXT NOT NULL,
+            like_count INTEGER,
+            retweet_count INTEGER,
+            reply_count INTEGER,
+            quote_count INTEGER,
+            polled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_engagement_snapshots_tweet ON engagement_snapshots (tweet_id, polled_at)")
     conn.commit()
-    conn.close()
 
 def setup_tweet_db():
     """Create tables to store tweets and replied tweet IDs for AI persona building and tracking replies."""
-    conn = sqlite3.connect("pig_bot.db")
+    conn = get_connection(TWEETS_DB)
     cursor = conn.cursor()
     
     # Table for storing tweets for AI persona building
@@ -52,6 +109,71 @@ def setup_tweet_db():
         )
     """)
 
+    # Full-text lore index over tweet texts (utils/lore_index.py), kept current by triggers on insert/delete
+    lore_index_exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'tweets_fts'").fetchone()
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS tweets_fts USING fts5(
+            tweet_text, content='tweets', content_rowid='id', tokenize='porter unicode61'
+        )
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS tweets_fts_insert AFTER INSERT ON tweets BEGIN
+            INSERT INTO tweets_fts (rowid, tweet_text) VALUES (new.id, new.tweet_text);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS tweets_fts_delete AFTER DELETE ON tweets BEGIN
+            INSERT INTO tweets_fts (tweets_fts, rowid, tweet_text) VALUES ('delete', old.id, old.tweet_text);
+        END
+    """)
+    if not lore_index_exists:
+        # Index tweets stored before the lore index existed
+        cursor.execute("INSERT INTO tweets_fts (tweets_fts) VALUES ('rebuild')")
+
+    # Incremental persona corpus aggregates (utils/persona_utils.py)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS persona_terms (
+            scope TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            term TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (scope, kind, term)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS persona_stats (
+            scope TEXT PRIMARY KEY,
+            tweets INTEGER NOT NULL DEFAULT 0,
+            tokens INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS persona_digest (
+            name TEXT PRIMARY KEY,
+            digest TEXT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Dense per-category sequence numbers for constant-time random sampling (utils/tweet_sampler.py)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tweet_samples (
+            category TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            tweet_rowid INTEGER NOT NULL,
+            created_ts REAL,
+            engagement INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (category, seq)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sample_categories (
+            category TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            max_engagement INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+
     # Table for tracking replied tweet IDs to prevent duplicate responses
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS replied_tweets (
@@ -59,26 +181,130 @@ def setup_tweet_db():
             responded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_replied_tweets_responded_at ON replied_tweets (responded_at)")
+
+    # Table for caching LLM replies keyed on persona + normalized input text
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS response_cache (
+            cache_key TEXT PRIMARY KEY,
+            persona TEXT,
+            response TEXT,
+            created_at REAL,
+            last_used REAL
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_response_cache_last_used ON response_cache (last_used)")
+
+    # Per-user ticker mention counts, refreshed incrementally for #pigID analysis
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ticker_mentions (
+            username TEXT NOT NULL,
+            ticker TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (username, ticker)
+        )
+    """)
+
+    # Dated ticker mentions per user, the history behind the #pigID scoring engine
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ticker_mention_history (
+            username TEXT NOT NULL,
+            tweet_id TEXT NOT NULL,
+            ticker TEXT NOT NULL,
+            mentioned_at REAL NOT NULL,
+            PRIMARY KEY (username, tweet_id, ticker)
+        )
+    """)
+    # Counts once summed every occurrence in a tweet; re-derive them as one per (tweet, ticker)
+    cursor.execute("""
+        INSERT OR REPLACE INTO ticker_mentions (username, ticker, count)
+        SELECT username, ticker, COUNT(*) FROM ticker_mention_history GROUP BY username, ticker
+    """)
+
+    # Tickers extracted once when a tweet is stored, so stored tweets are never rescanned
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tweet_tickers (
+            tweet_id TEXT NOT NULL,
+            ticker TEXT NOT NULL,
+            PRIMARY KEY (tweet_id, ticker)
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tweet_tickers_ticker ON tweet_tickers (ticker)")
+
+    # Every Dexscreener pair returned for a ticker, one row per pair per fetch
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS dex_snapshots (
+            ticker TEXT NOT NULL,
+            fetched_at REAL NOT NULL,
+            rank INTEGER NOT NULL,
+            chain_id TEXT,
+            pair_address TEXT,
+            price_usd REAL,
+            liquidity_usd REAL,
+            market_cap REAL,
+            fdv REAL
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_dex_snapshots_ticker ON dex_snapshots (ticker, fetched_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_dex_snapshots_pair ON dex_snapshots (pair_address, fetched_at)")
+
+    # Table for persisted polling cursors (e.g. the newest mention ID already fetched)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS cursors (
+            name TEXT PRIMARY KEY,
+            since_id TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
     
     conn.commit()
-    conn.close()
+
+    # Tweets stored before sampling existed are indexed once
+    if conn.execute("SELECT 1 FROM tweets LIMIT 1").fetchone() and not conn.execute("SELECT 1 FROM sample_categories LIMIT 1").fetchone():
+        rebuild_samples(conn)
+
+def get_cursor(name):
+    """Return the stored since_id for a named cursor, or None if it has never been set."""
+    conn = get_connection(TWEETS_DB)
+    try:
+        row = conn.execute("SELECT since_id FROM cursors WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+    except sqlite3.OperationalError as e:
+        logging.error(f"[DB ERROR] Failed to read cursor '{name}': {e}")
+        return None
+
+def _write_cursor(conn, name, since_id):
+    conn.execute("""
+        INSERT INTO cursors (name, since_id, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(name) DO UPDATE SET since_id = excluded.since_id, updated_at = excluded.updated_at
+    """, (name, str(since_id)))
+
+def set_cursor(name, since_id):
+    """Persist the since_id for a named cursor."""
+    conn = get_connection(TWEETS_DB)
+    _write_cursor(conn, name, since_id)
+    conn.commit()
 
 def fetch_and_store_hashtag_tweets(hashtag, max_count=5, category="general"):
     """Fetch recent tweets with a specified hashtag and store them in the database."""
     try:
-        response = client.search_recent_tweets(query=f"#{hashtag}", max_results=max_count, tweet_fields=["created_at"])
+        response = client.search_recent_tweets(query=f"#{hashtag}", max_results=max_count, tweet_fields=["created_at", "entities"], expansions="author_id")
         
         if not response.data:
             logging.info(f"No recent tweets found with #{hashtag}.")
             return
 
+        # Authors come back in the expansion payload, so usernames resolve without extra lookups
+        cache_users(response.includes.get("users"))
+
         tweets = []
         for tweet in response.data:
             tweet_data = {
                 "id": tweet.id,
                 "text": tweet.text,
                 "created_at": tweet.created_at,
-                "username": tweet.author_id,
+                "author_id": tweet.author_id,
+                "entities": tweet.entities,
                 "category": category
             }
             tweets.append(tweet_data)
@@ -90,90 +316,194 @@ def fetch_and_store_hashtag_tweets(hashtag, max_count=5, category="general"):
     except tweepy.TweepyException as e:
         logging.error(f"Error fetching #{hashtag} tweets: {e}")
 
-def store_tweets_in_db(tweets, category="general"):
-    """Store fetched tweets in the database under a specific category."""
-    conn = sqlite3.connect("pig_bot.db")
-    cursor = conn.cursor()
-    new_tweets = []
+def store_tweets_in_db(tweets, category="general", cursor=None):
+    """
+    Store fetched tweets in the database under a specific category with one INSERT OR IGNORE
+    executemany, extracting their tickers at the same time. A (name, since_id) cursor is
+    advanced in the same commit. Returns the tweets that were new.
+    """
+    if not tweets:
+        return []
+    conn = get_connection(TWEETS_DB)
 
+    # Resolve every missing username with one batched lookup instead of one request per tweet
+    missing_author_ids = [tweet["author_id"] for tweet in tweets if not tweet.get("username") and "author_id" in tweet]
+    usernames = resolve_usernames(client, missing_author_ids) if missing_author_ids else {}
+
+    # One lookup tells which tweets are already stored, so only new ones get ticker rows
+    existing = {row[0] for row in conn.execute(
+        "SELECT tweet_id FROM tweets WHERE tweet_id IN (SELECT value FROM json_each(?))",
+        (json.dumps([str(tweet["id"]) for tweet in tweets]),),
+    )}
+
+    new_tweets = []
+    rows = []
+    ticker_rows = []
     for tweet in tweets:
-        tweet_id = tweet["id"]
-        tweet_text = tweet.get("text", "")
-        created_at = tweet.get("created_at") or datetime.utcnow()
-        username = tweet.get("username", "")  # Use get() to avoid KeyError
-
-        # If the username is not available, fetch it by using the author_id
-        if not username and "author_id" in tweet:
-            author_id = tweet["author_id"]
-            try:
-                user = client.get_user(id=author_id)
-                username = user.data.username
-            except Exception as e:
-                logging.error(f"Error fetching username for author_id {author_id}: {e}")
-                username = "Unknown"
-
-        try:
-            cursor.execute("""
-                INSERT INTO tweets (tweet_id, username, tweet_text, created_at, category)
-                VALUES (?, ?, ?, ?, ?)
-            """, (tweet_id, username, tweet_text, created_at, category))
-            new_tweets.append(tweet)
-            logging.info(f"Stored tweet from {username} in category '{category}': {tweet_text}")
-        except sqlite3.IntegrityError:
-            logging.info(f"Tweet {tweet_id} by {username} already in database; skipping.")
+        tweet_id = str(tweet["id"])
+        if tweet_id in existing:
+            continue
+        existing.add(tweet_id)
+        username = tweet.get("username") or usernames.get(tweet.get("author_id"), "Unknown")
+        rows.append((tweet_id, username, tweet.get("text", ""), tweet.get("created_at") or datetime.utcnow(), category))
+        ticker_rows.extend((tweet_id, ticker) for ticker in tickers_in_tweet(tweet))
+        new_tweets.append(tweet)
 
-    conn.commit()
-    conn.close()
+    # Tweets, tickers, samples and the cursor commit together (or roll back together)
+    with conn:
+        conn.executemany("""
+            INSERT OR IGNORE INTO tweets (tweet_id, username, tweet_text, created_at, category)
+            VALUES (?, ?, ?, ?, ?)
+        """, rows)
+        conn.executemany("INSERT OR IGNORE INTO tweet_tickers (tweet_id, ticker) VALUES (?, ?)", ticker_rows)
+
+        # Register the new tweets for sampling
+        rowids = dict(conn.execute(
+            "SELECT tweet_id, id FROM tweets WHERE tweet_id IN (SELECT value FROM json_each(?))",
+            (json.dumps([row[0] for row in rows]),),
+        ).fetchall())
+        add_samples(conn, category, [
+            (rowids[str(tweet["id"])], to_timestamp(row[3]), total_engagements(tweet["public_metrics"]) if tweet.get("public_metrics") else 0)
+            for tweet, row in zip(new_tweets, rows)
+        ])
+        if cursor:
+            _write_cursor(conn, *cursor)
+    logging.info(f"Stored {len(new_tweets)} new tweets in category '{category}' ({len(tweets) - len(new_tweets)} already stored).")
     return new_tweets
 
 
+def get_tweets_mentioning(ticker, category=None):
+    """Return the IDs of stored tweets that mention a ticker, using the tickers extracted at store time."""
+    query = "SELECT tt.tweet_id FROM tweet_tickers tt JOIN tweets t ON t.tweet_id = tt.tweet_id WHERE tt.ticker = ?"
+    params = [normalize_ticker(ticker)]
+    if category:
+        query += " AND t.category = ?"
+        params.append(category)
+    return [row[0] for row in get_connection(TWEETS_DB).execute(query, params)]
+
 # Retrieve user IDs for specified usernames
 def get_user_ids(usernames):
-    """Retrieve user IDs for specified usernames."""
-    user_ids = {}
-    for username in usernames:
-        try:
-            user = client.get_user(username=username)
-            user_ids[username] = user.data.id
-            logging.info(f"Username: {username}, User ID: {user.data.id}")
-        except tweepy.TweepyException as e:
-            logging.error(f"Error fetching user ID for {username}: {e}")
+    """Retrieve user IDs for specified usernames (cached, batched lookups)."""
+    user_ids = resolve_user_ids(client, usernames)
+    for username, user_id in user_ids.items():
+        logging.info(f"Username: {username}, User ID: {user_id}")
     return user_ids
 
 # Fetch and store tweets using the reusable store_tweets_in_db function
-def fetch_and_store_tweets(user_id, username, max_count=8, max_retries=5):
+def fetch_and_store_tweets(user_id, username, max_count=8):
     """Fetch recent tweets from a user and store them in the database."""
-    retry_count = 0
-    while retry_count < max_retries:
-        try:
-            response = client.get_users_tweets(id=user_id, max_results=max_count)
-            if response.data:
-                store_tweets_in_db(response.data, username)
-            break  # Exit loop if request is successful
-
-        except tweepy.errors.TooManyRequests as e:
-            retry_count += 1
-            wait_time = 60 * (2 ** retry_count)  # Exponential backoff: 60s, 120s, 240s, etc.
-            logging.warning(f"Rate limit exceeded. Retrying in {wait_time} seconds... (Attempt {retry_count}/{max_retries})")
-            time.sleep(wait_time)
-        
-        except Exception as e:
-            logging.error(f"Error fetching tweets for user {username} (ID: {user_id}): {e}")
-            break  # Exit loop if it's a non-rate-limit error
+    try:
+        # Rate-limit waits and 429 retries are handled by the gateway
+        response = client.get_users_tweets(id=user_id, max_results=max_count, tweet_fields=["entities"])
+        if response.data:
+            store_tweets_in_db(response.data, username)
+    except Exception as e:
+        logging.error(f"Error fetching tweets for user {username} (ID: {user_id}): {e}")
 
-def update_tweet_database():
-    """Fetch recent tweets from specified influencers and hashtags, and store them in the database."""
-    usernames = ["blknoiz06", "MustStopMurad", "notthreadguy"]
-    user_ids = get_user_ids(usernames)
+class IngestSource:
+    """One incrementally ingested source (a user timeline or a hashtag search) and its since_id cursor."""
 
-    for username, user_id in user_ids.items():
-        fetch_and_store_tweets(user_id, username, max_count=8)
-        time.sleep(5)  # Add a 5-second delay between each user's tweets to avoid rate limits
+    def __init__(self, name, category, endpoint, params, page_param):
+        self.name = name
+        self.category = category
+        self.endpoint = endpoint
+        self.params = params
+        self.page_param = page_param
+        self.since_id = get_cursor(name)
+        self.tweets = []
+        self.pages = 0
+
+    def request(self, gateway, page_token=None):
+        """Queue the next page on the gateway; returns a Future of the response."""
+        params = dict(self.params, tweet_fields=INGEST_TWEET_FIELDS)
+        if self.since_id:
+            params.update(since_id=self.since_id, max_results=INGEST_PAGE_SIZE)
+        else:
+            params["max_results"] = INGEST_INITIAL_RESULTS
+        if page_token:
+            params[self.page_param] = page_token
+        self.pages += 1
+        return gateway.submit(self.endpoint, priority=PRIORITY_BACKGROUND, **params)
+
+    def store(self):
+        """Store the collected tweets and advance the cursor in the same commit; returns the number of new tweets."""
+        if not self.tweets:
+            return 0
+        tweets = [{
+            "id": tweet.id,
+            "text": tweet.text,
+            "created_at": tweet.created_at,
+            "author_id": tweet.author_id,
+            "entities": tweet.entities,
+            "public_metrics": tweet.public_metrics,
+        } for tweet in self.tweets]
+        new_tweets = store_tweets_in_db(tweets, self.category, cursor=(self.name, max(tweet.id for tweet in self.tweets)))
+        return len(new_tweets)
+
+
+def user_sources(usernames):
+    """Build timeline sources for the given usernames; IDs come from the user cache or one batched lookup."""
+    user_ids = resolve_user_ids(client, usernames)
+    for username in set(usernames) - set(user_ids):
+        logging.error(f"[INGEST] Could not resolve @{username}; skipping.")
+    return [
+        IngestSource(f"ingest:@{username.lower()}", username, "get_users_tweets", {"id": user_id}, "pagination_token")
+        for username, user_id in user_ids.items()
+    ]
+
+
+def hashtag_sources(hashtags):
+    """Build search sources for a {hashtag: category} mapping."""
+    return [
+        IngestSource(f"ingest:#{hashtag.lower()}", category, "search_recent_tweets",
+                     {"query": f"#{hashtag}", "expansions": "author_id"}, "next_token")
+        for hashtag, category in hashtags.items()
+    ]
+
+
+def ingest(sources):
+    """
+    Fetch every source concurrently through the gateway, which paces requests against each
+    endpoint's rate limit, and store each source as soon as its last page arrives.
+    Sources with a cursor follow pagination (up to INGEST_MAX_PAGES) to collect everything new.
+    """
+    from utils.clients import get_gateway
+    gateway = get_gateway()
+    pending = {source.request(gateway): source for source in sources}
+    stored = 0
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            source = pending.pop(future)
+            try:
+                response = future.result()
+            except Exception as e:
+                # The cursor is left untouched, so the next run fetches this source again
+                logging.error(f"[INGEST] Failed to fetch {source.name}: {e}")
+                continue
+            cache_users(response.includes.get("users"))
+            source.tweets.extend(response.data or [])
+            next_token = response.meta.get("next_token")
+            if source.since_id and next_token and source.pages < INGEST_MAX_PAGES:
+                pending[source.request(gateway, next_token)] = source
+                continue
+            if next_token and source.since_id:
+                logging.warning(f"[INGEST] {source.name} has more than {INGEST_MAX_PAGES} pages of new tweets; older ones are skipped.")
+            stored += source.store()
+    logging.info(f"[INGEST] Stored {stored} new tweets from {len(sources)} sources.")
+    return stored
+
+
+def update_tweet_database(usernames=None, hashtags=None):
+    """Incrementally ingest new tweets from the tracked influencers and hashtags."""
+    usernames = INFLUENCER_USERNAMES if usernames is None else usernames
+    hashtags = INGEST_HASHTAGS if hashtags is None else hashtags
+    stored = ingest(user_sources(usernames) + hashtag_sources(hashtags))
 
-    # Fetch and store tweets for hashtags with similar delay
-    fetch_and_store_hashtag_tweets("piglore", max_count=10, category="piglore")
-    time.sleep(5)
-    fetch_and_store_hashtag_tweets("pigIQ", max_count=10, category="pigIQ")
+    # Fold the new tweets into the persona aggregates (imported here: persona_utils depends on this module)
+    from utils.persona_utils import update_persona_corpus
+    update_persona_corpus()
+    return stored
 
 
 def initialize_tweet_data():
@@ -0,0 +1,136 @@
+# utils/db_manager.py
+# SQLite connection manager: one tuned WAL connection per thread per database,
+# plus a per-database write queue that group-commits queued writes in one transaction.
+
+import atexit
+import sqlite3
+import threading
+from queue import Queue, Empty
+from concurrent.futures import Future
+from config.config import SQLITE_BUSY_TIMEOUT_MS, WRITE_QUEUE_BATCH_SIZE
+from utils.logging_config import logging
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",  # Safe with WAL; commits no longer fsync
+    f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",  # ~16 MB page cache
+)
+
+_local = threading.local()
+_queues = {}
+_queues_lock = threading.Lock()
+
+
+def _connect(db_path, **kwargs):
+    conn = sqlite3.connect(db_path, timeout=SQLITE_BUSY_TIMEOUT_MS / 1000, **kwargs)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def get_connection(db_path):
+    """Return this thread's persistent connection to a database, opening it on first use."""
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(db_path)
+    if conn is None:
+        conn = connections[db_path] = _connect(db_path)
+    return conn
+
+
+class WriteQueue:
+    """Serializes writes to one database on a single thread, committing queued writes together."""
+
+    def __init__(self, db_path, batch_size=WRITE_QUEUE_BATCH_SIZE):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self._queue = Queue()
+        threading.Thread(target=self._run, name=f"write-queue-{db_path}", daemon=True).start()
+
+    def submit(self, query, params=(), many=False):
+        """Queue a write (executemany when many=True); returns a Future of the affected row count."""
+        future = Future()
+        self._queue.put((query, params, many, future))
+        return future
+
+    def submit_transaction(self, fn):
+        """Queue fn(conn) to run atomically inside the next group commit; returns a Future of its result."""
+        future = Future()
+        self._queue.put((fn, None, False, future))
+        return future
+
+    def flush(self):
+        """Block until everything queued so far has been committed."""
+        self.submit("SELECT 1").result()
+
+    def _run(self):
+        conn = _connect(self.db_path, isolation_level=None)
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except Empty:
+                    break
+            self._commit(conn, batch)
+
+    def _commit(self, conn, batch):
+        results = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for query, params, many, future in batch:
+                # A savepoint per write keeps one failing write from rolling back the others
+                conn.execute("SAVEPOINT queued_write")
+                try:
+                    if callable(query):
+                        result = query(conn)
+                    else:
+                        result = (conn.executemany(query, params) if many else conn.execute(query, params)).rowcount
+                    conn.execute("RELEASE queued_write")
+                    results.append((future, result, None))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO queued_write")
+                    conn.execute("RELEASE queued_write")
+                    logging.error(f"[DB ERROR] Failed to execute query '{getattr(query, '__name__', query).strip()}': {e}")
+                    results.append((future, None, e))
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            logging.error(f"[DB ERROR] Group commit of {len(batch)} writes to {self.db_path} failed: {e}")
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for _, _, _, future in batch:
+                future.set_exception(e)
+            return
+        for future, rowcount, error in results:
+            if error is None:
+                future.set_result(rowcount)
+            else:
+                future.set_exception(error)
+
+
+def get_write_queue(db_path):
+    """Return the shared write queue for a database, starting it on first use."""
+    with _queues_lock:
+        if db_path not in _queues:
+            _queues[db_path] = WriteQueue(db_path)
+        return _queues[db_path]
+
+
+def submit_write(db_path, query, params=(), many=False):
+    """Queue a write on the database's write queue; returns a Future of the affected row count."""
+    return get_write_queue(db_path).submit(query, params, many)
+
+
+def submit_transaction(db_path, fn):
+    """Queue fn(conn) on the database's write queue to run atomically; returns a Future of its result."""
+    return get_write_queue(db_path).submit_transaction(fn)
+
+
+@atexit.register
+def flush_all():
+    """Commit any queued writes before the process exits."""
+    for write_queue in list(_queues.values()):
+        write_queue.flush()
@@ -0,0 +1,63 @@
+# utils/engagement_tracker.py
+# Polls public metrics for all of the bot's young tweets with one timeline request
+# per page of 100, and keeps a history of metric snapshots in engagements.db.
+
+from datetime import datetime, timedelta
+from config.config import ENGAGEMENT_POLL_MAX_AGE_HOURS, ENGAGEMENT_POLL_MAX_RESULTS, ENGAGEMENT_POLL_MAX_PAGES, ENGAGEMENTS_DB
+from utils.db_manager import get_connection, submit_write
+from utils.logging_config import logging
+
+
+def total_engagements(metrics):
+    """Likes + retweets + replies, the total used for reward targets."""
+    return metrics["like_count"] + metrics["retweet_count"] + metrics["reply_count"]
+
+
+def store_snapshots(tweets):
+    """Queue one metrics snapshot per tweet as a single executemany write."""
+    rows = []
+    for tweet in tweets:
+        metrics = tweet.public_metrics
+        rows.append((str(tweet.id), metrics["like_count"], metrics["retweet_count"],
+                     metrics["reply_count"], metrics.get("quote_count", 0)))
+    return submit_write(ENGAGEMENTS_DB, """
+        INSERT INTO engagement_snapshots (tweet_id, like_count, retweet_count, reply_count, quote_count)
+        VALUES (?, ?, ?, ?, ?)
+    """, rows, many=True)
+
+
+def poll_engagements(twitter_api_v2, user_id, max_age_hours=ENGAGEMENT_POLL_MAX_AGE_HOURS):
+    """
+    Fetch the bot's tweets (including its mention replies) from the last `max_age_hours`
+    together with their public metrics, following pagination up to ENGAGEMENT_POLL_MAX_PAGES,
+    store a snapshot for each, and return {tweet_id: total_engagements}.
+    """
+    start_time = datetime.utcnow() - timedelta(hours=max_age_hours)
+    params = {
+        "id": user_id,
+        "max_results": ENGAGEMENT_POLL_MAX_RESULTS,
+        "start_time": start_time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "tweet_fields": ["public_metrics", "created_at"],
+    }
+    tweets = []
+    for _ in range(ENGAGEMENT_POLL_MAX_PAGES):
+        response = twitter_api_v2.get_users_tweets(**params)
+        tweets.extend(response.data or [])
+        next_token = response.meta.get("next_token")
+        if not next_token:
+            break
+        params["pagination_token"] = next_token
+    else:
+        logging.warning(f"[ENGAGEMENT POLL] More than {ENGAGEMENT_POLL_MAX_PAGES} pages of tweets in the last {max_age_hours} hours; older ones were not polled.")
+    if tweets:
+        store_snapshots(tweets)
+    logging.info(f"[ENGAGEMENT POLL] Polled metrics for {len(tweets)} tweets from the last {max_age_hours} hours.")
+    return {tweet.id: total_engagements(tweet.public_metrics) for tweet in tweets}
+
+
+def get_snapshots(tweet_id):
+    """Return the stored (polled_at, likes, retweets, replies, quotes) history for a tweet, oldest first."""
+    return get_connection(ENGAGEMENTS_DB).execute("""
+        SELECT polled_at, like_count, retweet_count, reply_count, quote_count
+        FROM engagement_snapshots WHERE tweet_id = ? ORDER BY polled_at
+    """, (str(tweet_id),)).fetchall()
@@ -0,0 +1,93 @@
+# utils/engager_collector.py
+# Streams every user who engaged with a tweet (likes, retweets, quotes, replies)
+# page by page, dedupes them and feeds each page to the bulk award path.
+# Pagination progress is stored per source so a run interrupted by rate limits resumes.
+
+import tweepy
+from config.config import ENGAGEMENTS_DB
+from utils.db_manager import get_connection, submit_write
+from utils.item_award import award_items_bulk
+from utils.logging_config import logging
+
+PAGE_SIZE = 100
+
+
+def _liking_users(twitter_api_v2, tweet_id, token):
+    response = twitter_api_v2.get_liking_users(tweet_id, max_results=PAGE_SIZE, pagination_token=token)
+    return response.data or [], response.meta.get("next_token")
+
+
+def _retweeters(twitter_api_v2, tweet_id, token):
+    response = twitter_api_v2.get_retweeters(tweet_id, max_results=PAGE_SIZE, pagination_token=token)
+    return response.data or [], response.meta.get("next_token")
+
+
+def _quoters(twitter_api_v2, tweet_id, token):
+    response = twitter_api_v2.get_quote_tweets(tweet_id, max_results=PAGE_SIZE, pagination_token=token, expansions="author_id")
+    return response.includes.get("users", []), response.meta.get("next_token")
+
+
+def _repliers(twitter_api_v2, tweet_id, token):
+    response = twitter_api_v2.search_recent_tweets(f"conversation_id:{tweet_id}", max_results=PAGE_SIZE,
+                                                   next_token=token, expansions="author_id")
+    return response.includes.get("users", []), response.meta.get("next_token")
+
+
+SOURCES = {
+    "likes": _liking_users,
+    "retweets": _retweeters,
+    "quotes": _quoters,
+    "replies": _repliers,
+}
+
+
+def get_progress(tweet_id, source):
+    """Return (next_token, done) for a tweet's engager source."""
+    row = get_connection(ENGAGEMENTS_DB).execute(
+        "SELECT next_token, done FROM engager_progress WHERE tweet_id = ? AND source = ?", (str(tweet_id), source)
+    ).fetchone()
+    return (row[0], bool(row[1])) if row else (None, False)
+
+
+def save_progress(tweet_id, source, next_token, done):
+    submit_write(ENGAGEMENTS_DB, """
+        INSERT INTO engager_progress (tweet_id, source, next_token, done) VALUES (?, ?, ?, ?)
+        ON CONFLICT(tweet_id, source) DO UPDATE SET next_token = excluded.next_token, done = excluded.done
+    """, (str(tweet_id), source, next_token, int(done))).result()
+
+
+def iter_engager_pages(twitter_api_v2, tweet_id, exclude_ids=()):
+    """
+    Yield (source, users, next_token) for each page of engagers not seen earlier in this run,
+    starting from the stored progress of each source.
+    """
+    seen = set(exclude_ids)  # User IDs only, to keep memory small on tweets with many engagers
+    for source, fetch_page in SOURCES.items():
+        token, done = get_progress(tweet_id, source)
+        while not done:
+            users, next_token = fetch_page(twitter_api_v2, tweet_id, token)
+            fresh = [user for user in users if user.id not in seen]
+            seen.update(user.id for user in fresh)
+            yield source, fresh, next_token
+            token, done = next_token, next_token is None
+
+
+def distribute_to_engagers(twitter_api_v2, tweet_id, item, exclude_ids=()):
+    """
+    Award `item` to every engager of a tweet, one bulk transaction per page.
+    Progress is saved after each page; if the rate limit is exhausted the run stops
+    and the next call resumes from the saved page.
+    Returns (awarded, finished): users awarded and whether every source was fully collected.
+    """
+    awarded = 0
+    finished = True
+    try:
+        for source, users, next_token in iter_engager_pages(twitter_api_v2, tweet_id, exclude_ids):
+            if users:
+                awarded += award_items_bulk(tweet_id, [(user.username, item, 1) for user in users]).result()
+            save_progress(tweet_id, source, next_token, next_token is None)
+    except tweepy.TooManyRequests:
+        finished = False
+        logging.warning(f"[ENGAGERS] Rate limit reached collecting engagers of tweet {tweet_id}; will resume on the next run.")
+    logging.info(f"[ENGAGERS] Awarded '{item}' to {awarded} engagers of tweet {tweet_id}.")
+    return awarded, finished
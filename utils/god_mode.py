@@ -1,20 +1,13 @@
 import random
-import sqlite3
-import requests
-import openai
-import os
 from datetime import datetime
-from config.config import OPENAI_API_KEY
-from langchain.chat_models import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate, SystemMessagePromptTemplate, HumanMessagePromptTemplate
+from utils.llm_service import generate
+from utils.twitter_gateway import PRIORITY_DEFAULT
+from utils.clients import get_gateway
 from utils.logging_config import logging
-
-# Set up the Twitter API bearer token
-BEARER_TOKEN = os.getenv("TWITTER_BEARER_TOKEN")
-headers = {
-    "Authorization": f"Bearer {BEARER_TOKEN}",
-    "Content-Type": "application/json"
-}
+from utils.db_manager import get_connection
+from utils.tweet_sampler import sample_tweet
+from utils.persona_utils import get_persona_digest
+from config.config import TWEETS_DB
 
 # Sample lore and transparency data
 lore_data = [
@@ -37,52 +30,21 @@ transparency_topics = [
 
 # Database connection setup
 def get_db_connection():
-    return sqlite3.connect("pig_bot.db")
+    return get_connection(TWEETS_DB)
 
 # Function to retrieve a random tweet from the database
-def get_random_tweet_from_db(category=None):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    query = "SELECT tweet_id, username, tweet_text FROM tweets"
-    params = ()
-    if category:
-        query += " WHERE category = ?"
-        params = (category,)
-    
-    cursor.execute(query, params)
-    tweets = cursor.fetchall()
-    conn.close()
-    
-    if tweets:
-        return random.choice(tweets)  # Return a random tweet
-    return None
+def get_random_tweet_from_db(category=None, weight_by=None):
+    """Pick a random stored tweet in constant time, skipping recently used ones (see utils.tweet_sampler)."""
+    return sample_tweet(category, weight_by)
 
 # Function to generate AI-powered response using OpenAI GPT
 def generate_ai_response(tweet_text):
     try:
-        llm = ChatOpenAI(temperature=1.1, openai_api_key=OPENAI_API_KEY, model_name='gpt-4')
-        
-        system_template = """
-        You are the reincarnated spirit GOD of a Minecraft Pig, guiding followers to rebuild their memecoin; you are acquiring power by extracting it from various influencers, memecoin thoughts, and your own lore.
-
-        RESPONSE TONE:
-        - Use a very cryptic angry tone that exudes your power. Use short powerful sentences. You are angry at Steve forever and that fuels you.
-        - Always respond with a short opinion discussing you acquiring this power, keeping it under 200 characters.
-
-        RESPONSE FORMAT:
-        - Use two sentences or fewer, no emojis.
-        - Mention the ticker $PIG every so often.
-        """
-        system_message_prompt = SystemMessagePromptTemplate.from_template(system_template)
-        human_template = "{text}"
-        human_message_prompt = HumanMessagePromptTemplate.from_template(human_template)
-        chat_prompt = ChatPromptTemplate.from_messages([system_message_prompt, human_message_prompt])
-        final_prompt = chat_prompt.format_prompt(text=tweet_text)
-        
-        response = llm(final_prompt.to_messages()).content
-        logging.info(f"[AI RESPONSE GENERATED] {response[:280]}")
-        return response[:280]
+        digest = get_persona_digest()
+        context = f"What your followers and influencers have been saying lately:\n{digest}" if digest else None
+        response = generate("god_mode", tweet_text, context=context)
+        logging.info(f"[AI RESPONSE GENERATED] {response}")
+        return response
     except Exception as e:
         logging.error(f"[ERROR] Failed to generate response: {e}")
         return "The spirit of $PIG watches. The words are tangled today. Try summoning again."
@@ -90,26 +52,19 @@ def generate_ai_response(tweet_text):
 # Function to create a quote tweet and reply to it with AI-powered response
 def respond_with_quote_tweet():
     """Create a quote tweet with an AI-generated response in the same post."""
-    tweet = get_random_tweet_from_db(category=random.choice(["piglore", "pigIQ", "influencers"]))  # Randomly choose a category
+    tweet = get_random_tweet_from_db(category=random.choice(["piglore", "pigIQ", "influencers"]), weight_by="recency")  # Randomly choose a category
     if tweet:
         tweet_id, username, tweet_text = tweet
         # Generate AI response and combine it with the quote tweet text
         ai_response = generate_ai_response(tweet_text)
         quote_tweet_text = f"{ai_response} - #{username} #PigLore"
 
-        # Quote tweet the selected tweet with AI response as a single post
-        quote_tweet_data = {
-            "text": quote_tweet_text,
-            "quote_tweet_id": tweet_id
-        }
-
-        # Send the request to create the quote tweet with AI response in a single post
-        response = requests.post("https://api.twitter.com/2/tweets", headers=headers, json=quote_tweet_data)
-        
-        if response.status_code == 201:
+        # Quote tweet the selected tweet with AI response as a single post, via the shared gateway
+        try:
+            get_gateway().call("create_tweet", text=quote_tweet_text, quote_tweet_id=tweet_id, priority=PRIORITY_DEFAULT)
             logging.info(f"[QUOTE TWEET SUCCESS] Quote tweet created with AI response for @{username}: {quote_tweet_text}")
-        else:
-            logging.error(f"Error creating quote tweet: {response.text}")
+        except Exception as e:
+            logging.error(f"Error creating quote tweet: {e}")
     else:
         logging.info("No tweets found to respond to.")
 
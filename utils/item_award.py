@@ -1,33 +1,57 @@
-import sqlite3
-import time
 import logging
-
-# Optimized function with retry mechanism
-def execute_with_retry(query, params=(), retries=5, delay=0.1):
-    conn = sqlite3.connect("engagements.db")
-    cursor = conn.cursor()
-    for attempt in range(retries):
-        try:
-            cursor.execute(query, params)
-            conn.commit()
-            break
-        except sqlite3.OperationalError as e:
-            if "database is locked" in str(e) and attempt < retries - 1:
-                time.sleep(delay)
-            else:
-                logging.error(f"[DB ERROR] Failed to execute query '{query}': {e}")
-                raise
-    conn.close()
+from config.config import ENGAGEMENTS_DB
+from utils.db_manager import submit_write, submit_transaction
 
 def award_item(username, reward_item):
     """
     Award a specific item to the user's inventory.
+    The write is group-committed by the engagements write queue; returns its Future.
     """
     query = """
     INSERT INTO inventory (username, item, quantity)
     VALUES (?, ?, 1)
     ON CONFLICT(username, item) DO UPDATE SET quantity = quantity + 1
     """
-    execute_with_retry(query, (username, reward_item))
+    future = submit_write(ENGAGEMENTS_DB, query, (username, reward_item))
     logging.info(f"[AWARD] {username} received 1 '{reward_item}' as a reward.")
+    return future
+
+def award_items_bulk(tweet_id, rows):
+    """
+    Award a batch of (username, item, quantity) rows for engagement on a tweet in one transaction.
+    Users already granted a reward for this tweet are skipped, so re-running a distribution
+    never double-awards. Returns a Future of the number of users newly awarded.
+    """
+    tweet_id = str(tweet_id)
+
+    def apply(conn):
+        conn.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS pending_grants (
+                username TEXT PRIMARY KEY,
+                item TEXT NOT NULL,
+                quantity INTEGER NOT NULL
+            )
+        """)
+        conn.execute("DELETE FROM temp.pending_grants")
+        conn.executemany("""
+            INSERT INTO temp.pending_grants (username, item, quantity) VALUES (?, ?, ?)
+            ON CONFLICT(username) DO UPDATE SET quantity = quantity + excluded.quantity
+        """, rows)
+        conn.execute("""
+            DELETE FROM temp.pending_grants
+            WHERE username IN (SELECT username FROM reward_grants WHERE tweet_id = ?)
+        """, (tweet_id,))
+        conn.execute("""
+            INSERT INTO inventory (username, item, quantity)
+            SELECT username, item, quantity FROM temp.pending_grants WHERE true
+            ON CONFLICT(username, item) DO UPDATE SET quantity = quantity + excluded.quantity
+        """)
+        awarded = conn.execute("""
+            INSERT INTO reward_grants (tweet_id, username, item, quantity)
+            SELECT ?, username, item, quantity FROM temp.pending_grants
+        """, (tweet_id,)).rowcount
+        conn.execute("DELETE FROM temp.pending_grants")
+        return awarded
 
+    apply.__name__ = f"award_items_bulk({tweet_id})"
+    return submit_transaction(ENGAGEMENTS_DB, apply)
@@ -0,0 +1,117 @@
+# utils/job_queue.py
+# SQLite-backed durable work queue with leases, retries and exactly-once completion.
+# Jobs survive restarts; several worker threads can drain a queue concurrently.
+
+import time
+import uuid
+import threading
+from config.config import ENGAGEMENTS_DB, JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS
+from utils.db_manager import get_connection
+from utils.logging_config import logging
+
+
+class Job:
+    def __init__(self, key, payload, attempts):
+        self.key = key
+        self.payload = payload
+        self.attempts = attempts
+
+
+class JobQueue:
+    def __init__(self, name, db_path=ENGAGEMENTS_DB, lease_seconds=JOB_LEASE_SECONDS, max_attempts=JOB_MAX_ATTEMPTS):
+        self.name = name
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    @property
+    def conn(self):
+        """This thread's connection to the queue database."""
+        return get_connection(self.db_path)
+
+    def enqueue(self, key, payload=None):
+        """Add a job once; returns False if a job with this key was already queued (or done)."""
+        with self.conn:
+            added = self.conn.execute("""
+                INSERT OR IGNORE INTO jobs (queue, job_key, payload, available_at) VALUES (?, ?, ?, ?)
+            """, (self.name, str(key), payload, time.time())).rowcount
+        return bool(added)
+
+    def lease(self, owner):
+        """Atomically claim the next ready job (or one whose lease expired); returns a Job or None."""
+        now = time.time()
+        with self.conn:
+            # A worker died holding the job's last allowed attempt: park it as failed instead of leased forever
+            expired = self.conn.execute("""
+                UPDATE jobs SET status = 'failed', lease_owner = NULL, last_error = 'Lease expired on the final attempt'
+                WHERE queue = ? AND status = 'leased' AND lease_expires < ? AND attempts >= ?
+            """, (self.name, now, self.max_attempts)).rowcount
+            row = self.conn.execute("""
+                UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1
+                WHERE rowid = (
+                    SELECT rowid FROM jobs
+                    WHERE queue = ? AND available_at <= ? AND attempts < ?
+                      AND (status = 'pending' OR (status = 'leased' AND lease_expires < ?))
+                    ORDER BY available_at LIMIT 1
+                )
+                RETURNING job_key, payload, attempts
+            """, (owner, now + self.lease_seconds, self.name, now, self.max_attempts, now)).fetchone()
+        if expired:
+            logging.error(f"[JOB QUEUE] {expired} {self.name} job(s) failed: lease expired on the final attempt.")
+        return Job(*row) if row else None
+
+    def complete(self, job, owner):
+        """Mark a leased job done; returns False if the lease was lost to another worker."""
+        with self.conn:
+            done = self.conn.execute("""
+                UPDATE jobs SET status = 'done', completed_at = CURRENT_TIMESTAMP, lease_owner = NULL
+                WHERE queue = ? AND job_key = ? AND status = 'leased' AND lease_owner = ?
+            """, (self.name, job.key, owner)).rowcount
+        if not done:
+            logging.warning(f"[JOB QUEUE] Lease on {self.name}/{job.key} was lost before completion.")
+        return bool(done)
+
+    def fail(self, job, owner, error):
+        """Return a failed job to the queue with backoff, or park it as failed after max attempts."""
+        status = "failed" if job.attempts >= self.max_attempts else "pending"
+        with self.conn:
+            self.conn.execute("""
+                UPDATE jobs SET status = ?, available_at = ?, last_error = ?, lease_owner = NULL
+                WHERE queue = ? AND job_key = ? AND lease_owner = ?
+            """, (status, time.time() + 60 * 2 ** job.attempts, str(error), self.name, job.key, owner))
+        logging.error(f"[JOB QUEUE] {self.name}/{job.key} attempt {job.attempts} failed ({status}): {error}")
+
+    def defer(self, job, owner, delay):
+        """Put a job back without counting the attempt (e.g. paused on a rate limit)."""
+        with self.conn:
+            self.conn.execute("""
+                UPDATE jobs SET status = 'pending', available_at = ?, attempts = attempts - 1, lease_owner = NULL
+                WHERE queue = ? AND job_key = ? AND lease_owner = ?
+            """, (time.time() + delay, self.name, job.key, owner))
+
+    def drain(self, handler, workers=1):
+        """
+        Process ready jobs with `workers` threads until none are left, then return.
+        handler(job) returns True when done, or a delay in seconds to defer the job; exceptions count as failures.
+        """
+        def work():
+            owner = f"{threading.current_thread().name}-{uuid.uuid4().hex[:8]}"
+            while True:
+                job = self.lease(owner)
+                if job is None:
+                    return
+                try:
+                    result = handler(job)
+                except Exception as e:
+                    self.fail(job, owner, e)
+                    continue
+                if result is True:
+                    self.complete(job, owner)
+                else:
+                    self.defer(job, owner, result or 60)
+
+        threads = [threading.Thread(target=work, name=f"{self.name}-worker-{i}") for i in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
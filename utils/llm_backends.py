@@ -0,0 +1,157 @@
+# utils/llm_backends.py
+# Pluggable chat backends behind utils.llm_service. A backend turns a list of chat messages
+# into reply text. OpenAIBackend is the production one; StubBackend is a deterministic local
+# stand-in (a Markov chain over the stored tweets) with simulated latency and failures, for
+# load-testing the reply path without network access or API costs.
+
+import json
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from itertools import islice
+import openai
+from langchain.chat_models import ChatOpenAI
+from config.config import OPENAI_API_KEY, LLM_MODEL_NAME, LLM_TEMPERATURE
+from config.config import LLM_STUB_LATENCY, LLM_STUB_ITEM_LATENCY, LLM_STUB_LATENCY_SIGMA, LLM_STUB_FAILURE_RATE, LLM_STUB_MALFORMED_RATE, LLM_STUB_SEED, LLM_STUB_CORPUS_SIZE
+from utils.clients import get_http_session
+
+
+class LLMBackendError(Exception):
+    """Raised by a backend when a request fails (the stub raises it to simulate API errors)."""
+
+
+class LLMBackend(ABC):
+    """Interface for chat backends: complete() returns the reply text for a list of chat messages."""
+
+    name = "base"
+
+    @abstractmethod
+    def complete(self, messages):
+        """Return the reply text for a list of langchain chat messages."""
+
+
+class OpenAIBackend(LLMBackend):
+    """OpenAI chat completions through langchain's ChatOpenAI, on a pooled keep-alive session."""
+
+    name = "openai"
+
+    def __init__(self, model_name=LLM_MODEL_NAME, temperature=LLM_TEMPERATURE):
+        # A dedicated pooled session: openai periodically closes and recreates its session
+        openai.requestssession = get_http_session("openai")
+        self.chat = ChatOpenAI(temperature=temperature, openai_api_key=OPENAI_API_KEY, model_name=model_name)
+
+    def complete(self, messages):
+        return self.chat(messages).content
+
+
+class StubBackend(LLMBackend):
+    """
+    Deterministic local backend. Replies come from a word-level Markov chain trained on stored
+    tweets (or the built-in lore when there are none). Latency is log-normal around `latency`
+    seconds plus `item_latency` per extra item of a batch request, and `failure_rate` /
+    `malformed_rate` make requests raise or batch replies unparseable. The same input always
+    produces the same reply, delay and outcome for a given seed.
+    """
+
+    name = "stub"
+
+    def __init__(self, latency=LLM_STUB_LATENCY, item_latency=LLM_STUB_ITEM_LATENCY, latency_sigma=LLM_STUB_LATENCY_SIGMA,
+                 failure_rate=LLM_STUB_FAILURE_RATE, malformed_rate=LLM_STUB_MALFORMED_RATE, seed=LLM_STUB_SEED, corpus=None):
+        self.latency = latency
+        self.item_latency = item_latency
+        self.latency_sigma = latency_sigma
+        self.failure_rate = failure_rate
+        self.malformed_rate = malformed_rate
+        self.seed = seed
+        self._corpus = corpus
+        self._chain = None
+        self._starts = None
+        self._lock = threading.Lock()
+
+    def _load_corpus(self):
+        if self._corpus is not None:
+            return list(self._corpus)
+        from utils.persona_utils import iter_tweet_texts
+        try:
+            corpus = list(islice(iter_tweet_texts(), LLM_STUB_CORPUS_SIZE))
+        except Exception:
+            corpus = []
+        if not corpus:
+            from utils.god_mode import lore_data
+            corpus = lore_data
+        return corpus
+
+    def _ensure_chain(self):
+        if self._chain is None:
+            with self._lock:
+                if self._chain is None:
+                    chain = {}
+                    starts = []
+                    for text in self._load_corpus():
+                        words = text.split()
+                        if len(words) < 2:
+                            continue
+                        starts.append(words[0])
+                        for current, following in zip(words, words[1:]):
+                            chain.setdefault(current, []).append(following)
+                    self._starts = starts or ["$PIG"]
+                    self._chain = chain
+
+    def babble(self, rng, max_chars=200):
+        """One Markov-generated reply of at most max_chars characters."""
+        self._ensure_chain()
+        word = rng.choice(self._starts)
+        words = [word]
+        length = len(word)
+        while word in self._chain and len(words) < 40:
+            word = rng.choice(self._chain[word])
+            if length + len(word) + 1 > max_chars:
+                break
+            words.append(word)
+            length += len(word) + 1
+        return " ".join(words)
+
+    def complete(self, messages):
+        text = messages[-1].content
+        rng = random.Random(f"{self.seed}\0{text}")
+        items = _batch_items(text)
+        # Output length, and so latency, grows with the number of replies requested
+        extra_items = len(items) - 1 if items else 0
+        time.sleep((self.latency + self.item_latency * extra_items) * rng.lognormvariate(0, self.latency_sigma))
+        if rng.random() < self.failure_rate:
+            raise LLMBackendError("Simulated backend failure")
+
+        if items is None:
+            return self.babble(rng)
+        if rng.random() < self.malformed_rate:
+            return "The spirit of $PIG refuses to speak in JSON today."
+        return json.dumps({item["id"]: self.babble(rng) for item in items})
+
+
+def _batch_items(text):
+    """The items of a batch payload (a JSON array of objects with an "id"), or None for a single input."""
+    if not text.startswith("["):
+        return None
+    try:
+        items = json.loads(text)
+    except ValueError:
+        return None
+    if isinstance(items, list) and all(isinstance(item, dict) and "id" in item for item in items):
+        return items
+    return None
+
+
+BACKENDS = {
+    OpenAIBackend.name: OpenAIBackend,
+    StubBackend.name: StubBackend,
+}
+
+
+def create_backend(name, **kwargs):
+    """Instantiate a backend by name ("openai" or "stub")."""
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown LLM backend '{name}' (expected one of: {', '.join(BACKENDS)})")
+    return backend_class(**kwargs)
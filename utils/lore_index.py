@@ -0,0 +1,76 @@
+# utils/lore_index.py
+# Local retrieval over the stored tweets corpus. tweets_fts is an FTS5 index on tweet texts that
+# triggers keep current as tweets are stored, so finding the lore most relevant to a mention is
+# one BM25-ranked query with no network call. Words that appear in a large share of the corpus
+# (known from the persona aggregates) are left out of the query: they add little to the ranking
+# but would make every query score most of the table.
+
+import re
+from config.config import TWEETS_DB, LORE_TOP_K, LORE_QUERY_TERMS, LORE_COMMON_TERM_FRACTION, LORE_FALLBACK_TERMS, LORE_SNIPPET_MAX_CHARS
+from utils.db_manager import get_connection
+
+QUERY_NOISE = re.compile(r"https?://\S+|@\w+")
+QUERY_WORD = re.compile(r"[A-Za-z][A-Za-z0-9]{2,}")
+QUERY_STOPWORDS = frozenset("""
+    and are but can did does for from had has have her him his how its just not our out she that the their
+    them then there they this too was were what when who why will with you your about would could should
+""".split())
+
+
+def query_terms(text):
+    """Distinct lowercase non-trivial words of text, in order of appearance."""
+    terms = []
+    for word in QUERY_WORD.findall(QUERY_NOISE.sub(" ", text or "")):
+        word = word.lower()
+        if word not in QUERY_STOPWORDS and word not in terms:
+            terms.append(word)
+    return terms
+
+
+def select_terms(conn, terms, max_terms=LORE_QUERY_TERMS):
+    """Keep the rarest terms, dropping ones found in more than LORE_COMMON_TERM_FRACTION of tweets."""
+    stats = conn.execute("SELECT tweets FROM persona_stats WHERE scope = 'all'").fetchone()
+    if not stats or not terms:
+        return terms[:max_terms]
+    # persona_terms holds the corpus' most frequent words; anything absent from it is rare
+    counts = dict(conn.execute(
+        f"SELECT term, count FROM persona_terms WHERE scope = 'all' AND kind = 'word' AND term IN ({','.join('?' * len(terms))})",
+        terms,
+    ).fetchall())
+    ranked = sorted(terms, key=lambda term: counts.get(term, 0))
+    rare = [term for term in ranked if counts.get(term, 0) <= stats[0] * LORE_COMMON_TERM_FRACTION]
+    return (rare or ranked[:LORE_FALLBACK_TERMS])[:max_terms]
+
+
+def build_match_query(terms):
+    """FTS5 OR-query over terms; quoting keeps them from being read as operators or column filters."""
+    return " OR ".join(f'"{term}"' for term in terms)
+
+
+def search_lore(text, k=LORE_TOP_K, categories=None):
+    """Return up to k (username, tweet_text, category) rows most relevant to text, best first."""
+    conn = get_connection(TWEETS_DB)
+    terms = select_terms(conn, query_terms(text))
+    if not terms:
+        return []
+    sql = """
+        SELECT t.username, t.tweet_text, t.category FROM tweets_fts
+        JOIN tweets t ON t.id = tweets_fts.rowid
+        WHERE tweets_fts MATCH ?
+    """
+    params = [build_match_query(terms)]
+    if categories:
+        sql += f" AND t.category IN ({','.join('?' * len(categories))})"
+        params.extend(categories)
+    sql += " ORDER BY bm25(tweets_fts) LIMIT ?"
+    params.append(k)
+    return conn.execute(sql, params).fetchall()
+
+
+def lore_context(text, k=LORE_TOP_K):
+    """Prompt context listing the lore snippets relevant to text, or None when nothing matches."""
+    snippets = search_lore(text, k)
+    if not snippets:
+        return None
+    lines = [f"- {tweet_text[:LORE_SNIPPET_MAX_CHARS]}" for _, tweet_text, _ in snippets]
+    return "Lore and chatter you have absorbed that relates to this message:\n" + "\n".join(lines)
@@ -1,10 +1,169 @@
-import sqlite3
-
-def get_tweet_corpus():
-    """Combine all tweet texts into a single corpus for persona building."""
-    conn = sqlite3.connect("pig_bot.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT tweet_text FROM tweets")
-    tweets = [row[0] for row in cursor.fetchall()]
-    conn.close()
-    return " ".join(tweets)
+# utils/persona_utils.py
+# Incremental persona corpus. Stored tweets are streamed in keyset batches past a high-water
+# cursor and folded into per-scope aggregates (overall, per category, per source): tweet and
+# token counts, top words, top two-word phrases and ticker frequencies. After each update a
+# compact digest is rebuilt, so prompts read a bounded, current summary with one lookup.
+
+import re
+from collections import Counter, defaultdict
+from config.config import TWEETS_DB, PERSONA_BATCH_SIZE, PERSONA_TERMS_KEPT, PERSONA_DIGEST_TERMS, PERSONA_DIGEST_MAX_CHARS
+from dex.ticker_extraction import TICKER_SCANNER
+from utils.db import get_cursor, set_cursor
+from utils.db_manager import get_connection
+from utils.logging_config import logging
+
+PERSONA_CURSOR = "persona_corpus"
+DIGEST_NAME = "persona"
+KINDS = ("word", "phrase", "ticker")
+
+NOISE_PATTERN = re.compile(r"https?://\S+|@\w+|#")
+WORD_PATTERN = re.compile(r"[a-z][a-z0-9']+")
+STOPWORDS = frozenset("""
+    a an and are as at be been but by can do does don't for from had has have he her him his how i i'm if im in
+    into is it it's its just me my no not of on or our out rt she so than that the their them then there they
+    this to too up us was we were what when who why will with you your amp
+""".split())
+
+
+def iter_tweet_texts(batch_size=PERSONA_BATCH_SIZE):
+    """Stream every stored tweet text in batches instead of loading the whole table."""
+    conn = get_connection(TWEETS_DB)
+    last_id = 0
+    while True:
+        rows = conn.execute("SELECT id, tweet_text FROM tweets WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch_size)).fetchall()
+        if not rows:
+            return
+        for _, text in rows:
+            yield text
+        last_id = rows[-1][0]
+
+
+def tokenize(text):
+    """Lowercase word tokens with links, mentions and tickers removed."""
+    return WORD_PATTERN.findall(TICKER_SCANNER.sub(" ", NOISE_PATTERN.sub(" ", (text or "").lower())))
+
+
+def _scopes(category, username):
+    scopes = ["all"]
+    if category:
+        scopes.append(f"category:{category}")
+    if username and username != "Unknown":
+        scopes.append(f"source:@{username.lower()}")
+    return scopes
+
+
+def _fold_batch(conn, rows):
+    """Add one batch of (id, username, category, text, tickers) rows to the aggregates; returns the (scope, kind) pairs touched."""
+    terms = defaultdict(Counter)
+    stats = defaultdict(lambda: [0, 0])
+    for _, username, category, text, tickers in rows:
+        tokens = tokenize(text)
+        words = [token for token in tokens if token not in STOPWORDS and len(token) > 2]
+        phrases = [f"{a} {b}" for a, b in zip(tokens, tokens[1:]) if a not in STOPWORDS and b not in STOPWORDS]
+        # Tickers were extracted once at store time (tweet_tickers); nothing is rescanned here
+        ticker_list = tickers.split() if tickers else []
+        for scope in _scopes(category, username):
+            terms[scope, "word"].update(words)
+            terms[scope, "phrase"].update(phrases)
+            terms[scope, "ticker"].update(ticker_list)
+            stats[scope][0] += 1
+            stats[scope][1] += len(tokens)
+
+    conn.executemany("""
+        INSERT INTO persona_terms (scope, kind, term, count) VALUES (?, ?, ?, ?)
+        ON CONFLICT(scope, kind, term) DO UPDATE SET count = count + excluded.count
+    """, [(scope, kind, term, count) for (scope, kind), counter in terms.items() for term, count in counter.items()])
+    conn.executemany("""
+        INSERT INTO persona_stats (scope, tweets, tokens) VALUES (?, ?, ?)
+        ON CONFLICT(scope) DO UPDATE SET tweets = tweets + excluded.tweets, tokens = tokens + excluded.tokens
+    """, [(scope, tweets, tokens) for scope, (tweets, tokens) in stats.items()])
+    return set(terms)
+
+
+def _prune(conn, scope_kinds):
+    """Keep only the top terms of each (scope, kind) so the aggregates stay bounded."""
+    conn.executemany("""
+        DELETE FROM persona_terms WHERE scope = ? AND kind = ? AND term IN (
+            SELECT term FROM persona_terms WHERE scope = ? AND kind = ? ORDER BY count DESC LIMIT -1 OFFSET ?
+        )
+    """, [(scope, kind, scope, kind, PERSONA_TERMS_KEPT) for scope, kind in scope_kinds])
+
+
+def get_top_terms(scope, kind, limit=PERSONA_DIGEST_TERMS):
+    """Return the top [(term, count), ...] of a kind ("word", "phrase" or "ticker") for a scope."""
+    return get_connection(TWEETS_DB).execute(
+        "SELECT term, count FROM persona_terms WHERE scope = ? AND kind = ? ORDER BY count DESC LIMIT ?",
+        (scope, kind, limit),
+    ).fetchall()
+
+
+def get_persona_summary(category=None, username=None):
+    """Aggregates for one scope: overall, a category or a source (username)."""
+    scope = f"category:{category}" if category else f"source:@{username.lower()}" if username else "all"
+    row = get_connection(TWEETS_DB).execute("SELECT tweets, tokens FROM persona_stats WHERE scope = ?", (scope,)).fetchone()
+    tweets, tokens = row or (0, 0)
+    summary = {"scope": scope, "tweets": tweets, "tokens": tokens}
+    for kind in KINDS:
+        summary[f"top_{kind}s"] = get_top_terms(scope, kind)
+    return summary
+
+
+def rebuild_digest(conn):
+    """Rebuild the stored digest: one line overall, then one per category, largest first, within the size cap."""
+    lines = []
+    length = 0
+    scopes = conn.execute("""
+        SELECT scope, tweets FROM persona_stats WHERE scope = 'all' OR scope LIKE 'category:%'
+        ORDER BY scope != 'all', tweets DESC
+    """).fetchall()
+    for scope, tweets in scopes:
+        parts = []
+        for kind in KINDS:
+            terms = [term for term, _ in get_top_terms(scope, kind)]
+            if terms:
+                parts.append(f"{kind}s: {', '.join(terms)}")
+        label = "overall" if scope == "all" else scope.split(":", 1)[1]
+        line = f"{label} ({tweets} tweets) - " + "; ".join(parts)
+        if length + len(line) > PERSONA_DIGEST_MAX_CHARS:
+            break
+        lines.append(line)
+        length += len(line) + 1
+    conn.execute("""
+        INSERT INTO persona_digest (name, digest, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(name) DO UPDATE SET digest = excluded.digest, updated_at = excluded.updated_at
+    """, (DIGEST_NAME, "\n".join(lines)))
+    conn.commit()
+
+
+def update_persona_corpus(batch_size=PERSONA_BATCH_SIZE):
+    """Fold tweets stored since the last update into the aggregates and refresh the digest; returns the count."""
+    conn = get_connection(TWEETS_DB)
+    last_id = int(get_cursor(PERSONA_CURSOR) or 0)
+    processed = 0
+    touched = set()
+    while True:
+        rows = conn.execute("""
+            SELECT t.id, t.username, t.category, t.tweet_text,
+                   (SELECT group_concat(ticker, ' ') FROM tweet_tickers tt WHERE tt.tweet_id = t.tweet_id)
+            FROM tweets t WHERE t.id > ? ORDER BY t.id LIMIT ?
+        """, (last_id, batch_size)).fetchall()
+        if not rows:
+            break
+        touched |= _fold_batch(conn, rows)
+        last_id = rows[-1][0]
+        # set_cursor commits on the same connection, so a batch and its cursor land together
+        set_cursor(PERSONA_CURSOR, last_id)
+        processed += len(rows)
+
+    if processed:
+        # Pruned once per update rather than per batch; tail terms may be slightly undercounted
+        _prune(conn, touched)
+        rebuild_digest(conn)
+        logging.info(f"[PERSONA] Folded {processed} new tweets into the persona aggregates.")
+    return processed
+
+
+def get_persona_digest():
+    """Return the stored persona digest ("" before the first update)."""
+    row = get_connection(TWEETS_DB).execute("SELECT digest FROM persona_digest WHERE name = ?", (DIGEST_NAME,)).fetchone()
+    return row[0] if row else ""
@@ -0,0 +1,94 @@
+# utils/replied_store.py
+# Tracks replied mention IDs in the indexed replied_tweets table of pig_bot.db
+
+import os
+import threading
+from config.config import REPLIED_MENTIONS_FILE, REPLIED_RETENTION_DAYS, REPLIED_FLUSH_SIZE, TWEETS_DB
+from utils.db_manager import get_connection
+from utils.db import setup_tweet_db, get_cursor, set_cursor
+from utils.logging_config import logging
+
+
+class RepliedStore:
+    """
+    Replied-mention IDs backed by the replied_tweets table.
+    Lookups hit the primary key index; writes are buffered and flushed in batches.
+    """
+
+    def __init__(self, db_path=TWEETS_DB, retention_days=REPLIED_RETENTION_DAYS, flush_size=REPLIED_FLUSH_SIZE):
+        setup_tweet_db()
+        self.retention_days = retention_days
+        self.flush_size = flush_size
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._pending = set()
+
+    @property
+    def conn(self):
+        """This thread's connection to the store's database."""
+        return get_connection(self.db_path)
+
+    def has_replied(self, mention_id):
+        """Check whether a mention ID has been replied to (buffered or stored)."""
+        mention_id = str(mention_id)
+        with self._lock:
+            if mention_id in self._pending:
+                return True
+            row = self.conn.execute("SELECT 1 FROM replied_tweets WHERE tweet_id = ?", (mention_id,)).fetchone()
+            return row is not None
+
+    def add(self, mention_id):
+        """Buffer a replied mention ID; the buffer is flushed once it reaches flush_size."""
+        with self._lock:
+            self._pending.add(str(mention_id))
+            if len(self._pending) >= self.flush_size:
+                self._flush_locked()
+
+    def flush(self):
+        """Write all buffered mention IDs in a single transaction."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        with self.conn:
+            self.conn.executemany("INSERT OR IGNORE INTO replied_tweets (tweet_id) VALUES (?)",
+                                   [(mention_id,) for mention_id in self._pending])
+        logging.info(f"Saved {len(self._pending)} replied mention IDs.")
+        self._pending.clear()
+
+    def compact(self):
+        """Drop replied IDs older than the retention window and return how many were removed."""
+        with self._lock:
+            with self.conn:
+                deleted = self.conn.execute(
+                    "DELETE FROM replied_tweets WHERE responded_at < datetime('now', ?)",
+                    (f"-{self.retention_days} days",)
+                ).rowcount
+        if deleted:
+            logging.info(f"[COMPACT] Removed {deleted} replied mention IDs older than {self.retention_days} days.")
+        return deleted
+
+    def import_file(self, path=REPLIED_MENTIONS_FILE):
+        """
+        Migrate a legacy replied_mentions.txt into the table. The file is left in place (it is
+        tracked in git); the import is recorded in the cursors table, so an unchanged file is only
+        imported once. Returns the number of IDs read from the file (0 when skipped).
+        """
+        if not os.path.exists(path):
+            return 0
+        stat = os.stat(path)
+        fingerprint = f"{stat.st_size}:{stat.st_mtime_ns}"
+        cursor_name = f"replied_import:{os.path.basename(path)}"
+        if get_cursor(cursor_name) == fingerprint:
+            return 0
+        with open(path, "r") as file:
+            mention_ids = [(line.strip(),) for line in file if line.strip()]
+        with self._lock:
+            with self.conn:
+                self.conn.executemany("INSERT OR IGNORE INTO replied_tweets (tweet_id) VALUES (?)", mention_ids)
+        # Recorded after the IDs are committed; re-importing is harmless (INSERT OR IGNORE)
+        set_cursor(cursor_name, fingerprint)
+        logging.info(f"[MIGRATION] Imported {len(mention_ids)} replied mention IDs from {path}.")
+        return len(mention_ids)
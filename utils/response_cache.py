@@ -0,0 +1,114 @@
+# utils/response_cache.py
+# SQLite-backed cache of LLM replies keyed on persona + normalized input text,
+# with TTL expiry, LRU size cap and a reuse-vs-regenerate policy.
+
+import re
+import time
+import random
+import hashlib
+import threading
+from config.config import RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL, RESPONSE_CACHE_REUSE_PROBABILITY, TWEETS_DB
+from utils.db_manager import get_connection
+from utils.db import setup_tweet_db
+from utils.logging_config import logging
+
+URL_PATTERN = re.compile(r"https?://\S+")
+HANDLE_PATTERN = re.compile(r"@\w+")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_text(text):
+    """Normalize tweet text so trivially different copies share a cache entry."""
+    text = URL_PATTERN.sub("", text.lower())
+    text = HANDLE_PATTERN.sub("", text)
+    return WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+def make_key(persona, text):
+    return hashlib.sha1(f"{persona}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, db_path=TWEETS_DB, max_entries=RESPONSE_CACHE_MAX_ENTRIES, ttl=RESPONSE_CACHE_TTL,
+                 reuse_probability=RESPONSE_CACHE_REUSE_PROBABILITY):
+        setup_tweet_db()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.reuse_probability = reuse_probability
+        self.hits = 0
+        self.misses = 0
+        self.regenerations = 0
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self):
+        """This thread's connection to the cache database."""
+        return get_connection(self.db_path)
+
+    def get(self, persona, text):
+        """
+        Return a cached reply, or None on a miss, an expired entry,
+        or when the reuse policy decides to regenerate for variety.
+        """
+        key = make_key(persona, text)
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute("SELECT response, created_at FROM response_cache WHERE cache_key = ?", (key,)).fetchone()
+            if row is None or row[1] + self.ttl < now:
+                self.misses += 1
+                return None
+            if random.random() >= self.reuse_probability:
+                self.regenerations += 1
+                return None
+            with self.conn:
+                self.conn.execute("UPDATE response_cache SET last_used = ? WHERE cache_key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, persona, text, response):
+        """Store a reply and evict expired and least recently used entries beyond the size cap."""
+        key = make_key(persona, text)
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute("""
+                INSERT INTO response_cache (cache_key, persona, response, created_at, last_used) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(cache_key) DO UPDATE SET response = excluded.response,
+                    created_at = excluded.created_at, last_used = excluded.last_used
+            """, (key, persona, response, now, now))
+            self.conn.execute("DELETE FROM response_cache WHERE created_at < ?", (now - self.ttl,))
+            self.conn.execute("""
+                DELETE FROM response_cache WHERE cache_key IN (
+                    SELECT cache_key FROM response_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+
+    def stats(self):
+        """Return hit/miss counters and the hit rate."""
+        lookups = self.hits + self.misses + self.regenerations
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "regenerations": self.regenerations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Return the process-wide response cache, creating it on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
+
+
+def log_cache_stats():
+    stats = get_response_cache().stats()
+    logging.info(f"[RESPONSE CACHE] hits={stats['hits']} misses={stats['misses']} "
+                 f"regenerations={stats['regenerations']} hit_rate={stats['hit_rate']:.2%}")
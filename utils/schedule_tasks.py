@@ -1,32 +1,26 @@
 import logging
+import time
 import tweepy
 import schedule
-from datetime import datetime
-from utils.rewards_service import distribute_rewards, shuffle_reward
+from utils.rewards_service import flag_goal_achieved, background_api
 from bot.twitter_bot import TwitterBot
 from utils.db import update_tweet_database
+from utils.engagement_tracker import poll_engagements
 
 # Define engagement target
 ENGAGEMENT_TOTAL_TARGET = 5
-goal_achieved_tweets = set()  # Tracks tweets that met engagement goal
 
-def check_engagements():
-    """Check recent tweets by the bot for engagement and flag those that meet the target."""
-    bot = TwitterBot()
+def check_engagements(bot):
+    """Check the running bot's recent tweets for engagement and flag those that meet the target."""
     try:
-        bot_tweets = bot.twitter_api_v2.get_users_tweets(id=bot.twitter_me_id, max_results=10)
-        for tweet in bot_tweets.data:
-            tweet_id = tweet.id
-            if tweet_id not in goal_achieved_tweets:
-                tweet_metrics = bot.twitter_api_v2.get_tweet(tweet_id, tweet_fields="public_metrics").data["public_metrics"]
-                total_engagements = tweet_metrics["like_count"] + tweet_metrics["retweet_count"] + tweet_metrics["reply_count"]
-                logging.info(f"Tweet {tweet_id} total engagements: {total_engagements}")
-
-                if total_engagements >= ENGAGEMENT_TOTAL_TARGET:
-                    goal_achieved_tweets.add(tweet_id)  # Only add to achieved set
-                    distribute_rewards(tweet_id)  # Distribute rewards when goal is met
-                    shuffle_reward()  # Rotate reward for the next round
-                    logging.info(f"Tweet {tweet_id} met engagement target; rewards distributed and shuffled.")
+        # One timeline request per page returns metrics for every young bot tweet
+        engagements = poll_engagements(background_api, bot.twitter_me_id)
+        for tweet_id, total_engagements in engagements.items():
+            logging.info(f"Tweet {tweet_id} total engagements: {total_engagements}")
+
+            if total_engagements >= ENGAGEMENT_TOTAL_TARGET:
+                # Durably queue the tweet; distribute_rewards_for_goals distributes and shuffles
+                flag_goal_achieved(tweet_id)
     except tweepy.TweepyException as e:
         logging.error(f"Error fetching engagement data: {e}")
 
@@ -51,13 +45,13 @@ def post_tweet(bot, content):
         else:
             logging.error(f"Failed to post tweet: {e}")
 
-# Schedule tasks that are specific to engagement and reward tracking
-schedule.every(8).hours.do(update_tweet_database)
-schedule.every().hour.do(check_engagements)
-
 # Main loop to run all scheduled tasks
 if __name__ == "__main__":
     logging.info("Starting scheduled tasks...")
+    # Jobs are registered here (and in main.py) with the live bot, never at import time
+    bot = TwitterBot()
+    schedule.every(8).hours.do(update_tweet_database)
+    schedule.every().hour.do(check_engagements, bot)
     while True:
         schedule.run_pending()
         time.sleep(1)
@@ -0,0 +1,131 @@
+# utils/tweet_sampler.py
+# Constant-time random sampling of stored tweets. Every tweet gets a dense per-category
+# sequence number in tweet_samples when it is stored, and sample_categories keeps each
+# category's size, so a pick is one random integer and one primary-key lookup no matter
+# how many tweets there are. Weighted picks (recency / engagement) use rejection sampling.
+
+import math
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from config.config import TWEETS_DB, SAMPLE_MAX_TRIES, SAMPLE_RECENT_SIZE, SAMPLE_RECENCY_HALF_LIFE_DAYS
+from utils.db_manager import get_connection
+
+# Tweets picked recently, skipped by later picks
+recently_used = deque(maxlen=SAMPLE_RECENT_SIZE)
+_recent_lock = threading.Lock()
+
+
+def to_timestamp(created_at):
+    """Epoch seconds for a stored created_at (datetime or ISO string); now if missing or unparseable."""
+    if isinstance(created_at, str):
+        try:
+            created_at = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+        except ValueError:
+            return time.time()
+    if isinstance(created_at, datetime):
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        return created_at.timestamp()
+    return time.time()
+
+
+def add_samples(conn, category, rows):
+    """
+    Register newly stored tweets of one category: rows are (tweet_rowid, created_ts, engagement).
+    Runs on the caller's connection so it commits together with the tweets themselves.
+    """
+    if not rows:
+        return
+    current = conn.execute("SELECT size FROM sample_categories WHERE category = ?", (category,)).fetchone()
+    size = current[0] if current else 0
+    conn.executemany("""
+        INSERT INTO tweet_samples (category, seq, tweet_rowid, created_ts, engagement) VALUES (?, ?, ?, ?, ?)
+    """, [(category, size + i, rowid, created_ts, engagement) for i, (rowid, created_ts, engagement) in enumerate(rows, start=1)])
+    conn.execute("""
+        INSERT INTO sample_categories (category, size, max_engagement) VALUES (?, ?, ?)
+        ON CONFLICT(category) DO UPDATE SET size = excluded.size,
+            max_engagement = MAX(max_engagement, excluded.max_engagement)
+    """, (category, size + len(rows), max(engagement for _, _, engagement in rows)))
+
+
+def rebuild_samples(conn):
+    """Index every stored tweet from scratch (used once for tweets stored before sampling existed)."""
+    conn.execute("DELETE FROM tweet_samples")
+    conn.execute("DELETE FROM sample_categories")
+    conn.execute("""
+        INSERT INTO tweet_samples (category, seq, tweet_rowid, created_ts, engagement)
+        SELECT category, ROW_NUMBER() OVER (PARTITION BY category ORDER BY id), id,
+               COALESCE(CAST(strftime('%s', created_at) AS REAL), CAST(strftime('%s', 'now') AS REAL)), 0
+        FROM tweets WHERE category IS NOT NULL
+    """)
+    conn.execute("""
+        INSERT INTO sample_categories (category, size, max_engagement)
+        SELECT category, MAX(seq), MAX(engagement) FROM tweet_samples GROUP BY category
+    """)
+    conn.commit()
+
+
+def _weight(weight_by, created_ts, engagement, max_engagement, now):
+    """Acceptance probability in (0, 1] for a candidate."""
+    if weight_by == "recency":
+        age_days = max(now - created_ts, 0) / 86400
+        return 2 ** (-age_days / SAMPLE_RECENCY_HALF_LIFE_DAYS)
+    if weight_by == "engagement":
+        return (1 + math.log1p(engagement)) / (1 + math.log1p(max_engagement))
+    return 1.0
+
+
+def _mark_used(tweet_id):
+    with _recent_lock:
+        recently_used.append(tweet_id)
+
+
+def sample_tweet(category=None, weight_by=None):
+    """
+    Pick a random stored tweet, optionally within a category, as (tweet_id, username, tweet_text).
+    weight_by="recency" favours newer tweets and weight_by="engagement" favours tweets with more
+    likes / retweets / replies / quotes. Recently picked tweets are skipped. Returns None if empty.
+    """
+    conn = get_connection(TWEETS_DB)
+    query = "SELECT category, size, max_engagement FROM sample_categories WHERE size > 0"
+    params = ()
+    if category:
+        query += " AND category = ?"
+        params = (category,)
+    categories = conn.execute(query, params).fetchall()
+    if not categories:
+        return None
+
+    now = time.time()
+    with _recent_lock:
+        recent = set(recently_used)
+    best, best_weight, fallback = None, -1, None
+    for _ in range(SAMPLE_MAX_TRIES):
+        # A category is drawn in proportion to its size, so the pick is uniform over all tweets
+        chosen, size, max_engagement = random.choices(categories, weights=[c[1] for c in categories])[0]
+        row = conn.execute("""
+            SELECT t.tweet_id, t.username, t.tweet_text, s.created_ts, s.engagement
+            FROM tweet_samples s JOIN tweets t ON t.id = s.tweet_rowid
+            WHERE s.category = ? AND s.seq = ?
+        """, (chosen, random.randint(1, size))).fetchone()
+        if row is None:
+            continue
+        if row[0] in recent:
+            fallback = fallback or row
+            continue
+        weight = _weight(weight_by, row[3], row[4], max_engagement, now)
+        if random.random() < weight:
+            best = row
+            break
+        if weight > best_weight:
+            best, best_weight = row, weight
+
+    # Only recently used tweets were drawn (e.g. a tiny category): repeat one rather than return nothing
+    best = best or fallback
+    if best is None:
+        return None
+    _mark_used(best[0])
+    return best[:3]
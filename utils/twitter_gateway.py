@@ -0,0 +1,245 @@
+# utils/twitter_gateway.py
+# Single rate-limit-aware gateway for every Twitter API call made by the bot.
+# Each endpoint has a token bucket seeded from the x-rate-limit-* response headers;
+# calls are queued by priority and a call to an exhausted endpoint is parked until
+# its window resets instead of blocking the workers serving other endpoints.
+
+import time
+import heapq
+import asyncio
+import itertools
+import functools
+import threading
+import tweepy
+import requests
+from queue import PriorityQueue
+from concurrent.futures import Future
+from config.config import TWITTER_API_KEY, TWITTER_API_SECRET, TWITTER_ACCESS_TOKEN, TWITTER_ACCESS_TOKEN_SECRET, TWITTER_BEARER_TOKEN
+from config.config import GATEWAY_WORKERS, GATEWAY_MAX_RETRIES
+from utils.logging_config import logging
+
+# Lower values are served first
+PRIORITY_REPLY = 0
+PRIORITY_DEFAULT = 5
+PRIORITY_BACKGROUND = 10
+
+_local = threading.local()  # Endpoint name of the call running on the current worker thread
+
+
+class TokenBucket:
+    """Request budget for one endpoint within its current rate-limit window."""
+
+    def __init__(self):
+        self.limit = None  # Unknown until the first response headers arrive
+        self.remaining = None
+        self.reset_at = 0.0
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        """Take a token; returns 0 on success, otherwise the seconds until the window resets."""
+        with self._lock:
+            now = time.time()
+            if self.remaining is None:
+                return 0
+            if now >= self.reset_at:
+                self.remaining = self.limit
+            if self.remaining > 0:
+                self.remaining -= 1
+                return 0
+            return max(self.reset_at - now, 0.5)
+
+    def update(self, headers):
+        """Seed the bucket from x-rate-limit-limit / -remaining / -reset headers."""
+        try:
+            limit = int(headers["x-rate-limit-limit"])
+            remaining = int(headers["x-rate-limit-remaining"])
+            reset_at = float(headers["x-rate-limit-reset"])
+        except (KeyError, TypeError, ValueError):
+            return
+        with self._lock:
+            self.limit, self.remaining, self.reset_at = limit, remaining, reset_at
+
+
+def rate_limited_error(endpoint, bucket):
+    """A TooManyRequests for a call refused locally because its endpoint's bucket is exhausted."""
+    response = requests.Response()
+    response.status_code = 429
+    response.reason = f"Too Many Requests ({endpoint} budget exhausted)"
+    response.headers.update({"x-rate-limit-limit": str(bucket.limit), "x-rate-limit-remaining": "0",
+                             "x-rate-limit-reset": str(int(bucket.reset_at))})
+    return tweepy.TooManyRequests(response, response_json={})
+
+
+class GatewayClient(tweepy.Client):
+    """tweepy.Client that reports rate-limit headers of every response to the gateway."""
+
+    def __init__(self, gateway, **kwargs):
+        super().__init__(wait_on_rate_limit=False, **kwargs)
+        self.gateway = gateway
+
+    def request(self, method, route, params=None, json=None, user_auth=False):
+        endpoint = getattr(_local, "endpoint", None)
+        try:
+            response = super().request(method, route, params=params, json=json, user_auth=user_auth)
+        except tweepy.TooManyRequests as e:
+            self.gateway.observe(endpoint, e.response.headers)
+            raise
+        self.gateway.observe(endpoint, response.headers)
+        return response
+
+
+class GatewayProxy:
+    """
+    Drop-in stand-in for a tweepy Client/API whose method calls are routed through the gateway.
+    Without an explicit gateway the shared one from utils.clients is used, created on first call.
+    `max_retries` overrides the gateway's rate-limit retries for every call made through the proxy.
+    """
+
+    def __init__(self, priority=PRIORITY_DEFAULT, target="v2", gateway=None, max_retries=None):
+        self._priority = priority
+        self._target = target
+        self._gateway = gateway
+        self._max_retries = max_retries
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if self._gateway is None:
+            from utils.clients import get_gateway
+            self._gateway = get_gateway()
+        method = getattr(self._gateway.targets[self._target], name)
+        if not callable(method):
+            return method
+        endpoint = name if self._target == "v2" else f"{self._target}.{name}"
+
+        @functools.wraps(method)
+        def call(*args, **kwargs):
+            return self._gateway.call(endpoint, *args, priority=self._priority, max_retries=self._max_retries, **kwargs)
+        return call
+
+
+class TwitterGateway:
+    def __init__(self, client=None, api_v1=None, session=None, workers=GATEWAY_WORKERS, max_retries=GATEWAY_MAX_RETRIES):
+        self.client = client or GatewayClient(
+            self,
+            bearer_token=TWITTER_BEARER_TOKEN,
+            consumer_key=TWITTER_API_KEY,
+            consumer_secret=TWITTER_API_SECRET,
+            access_token=TWITTER_ACCESS_TOKEN,
+            access_token_secret=TWITTER_ACCESS_TOKEN_SECRET,
+        )
+        self.api_v1 = api_v1 or tweepy.API(tweepy.OAuth1UserHandler(
+            TWITTER_API_KEY, TWITTER_API_SECRET, TWITTER_ACCESS_TOKEN, TWITTER_ACCESS_TOKEN_SECRET
+        ))
+        self.session = session or requests.Session()
+        # Every client shares one keep-alive connection pool
+        self.client.session = self.session
+        self.api_v1.session = self.session
+        self.targets = {"v2": self.client, "v1": self.api_v1}
+        self.max_retries = max_retries
+
+        self._buckets = {}
+        self._buckets_lock = threading.Lock()
+        self._queue = PriorityQueue()
+        self._seq = itertools.count()
+        self._parked = []  # Heap of (ready_at, seq, job) waiting for a rate-limit window to reset
+        self._parked_cond = threading.Condition()
+
+        for i in range(workers):
+            threading.Thread(target=self._work, name=f"twitter-gateway-{i}", daemon=True).start()
+        threading.Thread(target=self._release_parked, name="twitter-gateway-timer", daemon=True).start()
+
+    def bucket(self, endpoint):
+        with self._buckets_lock:
+            if endpoint not in self._buckets:
+                self._buckets[endpoint] = TokenBucket()
+            return self._buckets[endpoint]
+
+    def observe(self, endpoint, headers):
+        """Record the rate-limit headers of a response for an endpoint."""
+        if endpoint:
+            self.bucket(endpoint).update(headers)
+
+    def proxy(self, priority=PRIORITY_DEFAULT, target="v2", max_retries=None):
+        return GatewayProxy(priority, target, gateway=self, max_retries=max_retries)
+
+    def submit(self, endpoint, *args, priority=PRIORITY_DEFAULT, max_retries=None, **kwargs):
+        """
+        Queue a call to a Client method (or "v1.<method>" for the v1.1 API); returns a Future.
+        `max_retries` overrides the gateway default for this call. With 0 the call never waits on a
+        rate limit: it fails with TooManyRequests at once, so callers can save progress and resume.
+        """
+        target, _, name = endpoint.rpartition(".")
+        fn = getattr(self.targets[target or "v2"], name)
+        return self._enqueue(endpoint, priority, fn, args, kwargs, max_retries)
+
+    def submit_http(self, endpoint, method, url, priority=PRIORITY_DEFAULT, **kwargs):
+        """Queue a raw HTTP request on the gateway session; returns a Future of the requests.Response."""
+        def send(**request_kwargs):
+            response = self.session.request(method, url, **request_kwargs)
+            self.observe(endpoint, response.headers)
+            return response
+        return self._enqueue(endpoint, priority, send, (), kwargs)
+
+    def call(self, endpoint, *args, priority=PRIORITY_DEFAULT, max_retries=None, **kwargs):
+        """Blocking wrapper around submit()."""
+        return self.submit(endpoint, *args, priority=priority, max_retries=max_retries, **kwargs).result()
+
+    async def acall(self, endpoint, *args, priority=PRIORITY_DEFAULT, max_retries=None, **kwargs):
+        """Awaitable wrapper around submit() for asyncio callers."""
+        return await asyncio.wrap_future(self.submit(endpoint, *args, priority=priority, max_retries=max_retries, **kwargs))
+
+    def _enqueue(self, endpoint, priority, fn, args, kwargs, max_retries=None):
+        job = {"endpoint": endpoint, "priority": priority, "fn": fn, "args": args, "kwargs": kwargs,
+               "future": Future(), "retries": 0,
+               "max_retries": self.max_retries if max_retries is None else max_retries}
+        self._queue.put((priority, next(self._seq), job))
+        return job["future"]
+
+    def _park(self, job, delay):
+        with self._parked_cond:
+            heapq.heappush(self._parked, (time.monotonic() + delay, next(self._seq), job))
+            self._parked_cond.notify()
+
+    def _release_parked(self):
+        """Move parked jobs back onto the queue once their endpoint's window has reset."""
+        while True:
+            with self._parked_cond:
+                while not self._parked or self._parked[0][0] > time.monotonic():
+                    timeout = self._parked[0][0] - time.monotonic() if self._parked else None
+                    self._parked_cond.wait(timeout)
+                _, _, job = heapq.heappop(self._parked)
+            self._queue.put((job["priority"], next(self._seq), job))
+
+    def _work(self):
+        while True:
+            _, _, job = self._queue.get()
+            endpoint = job["endpoint"]
+            bucket = self.bucket(endpoint)
+            wait = bucket.try_acquire()
+            if wait:
+                if job["max_retries"] == 0:
+                    job["future"].set_exception(rate_limited_error(endpoint, bucket))
+                else:
+                    self._park(job, wait)
+                continue
+
+            _local.endpoint = endpoint
+            try:
+                result = job["fn"](*job["args"], **job["kwargs"])
+            except tweepy.TooManyRequests as e:
+                self.observe(endpoint, e.response.headers)
+                if job["retries"] < job["max_retries"]:
+                    job["retries"] += 1
+                    delay = max(float(e.response.headers.get("x-rate-limit-reset", 0)) - time.time(), 1)
+                    logging.warning(f"[RATE LIMIT] {endpoint} exhausted; retrying in {delay:.0f} seconds.")
+                    self._park(job, delay)
+                else:
+                    job["future"].set_exception(e)
+            except BaseException as e:
+                job["future"].set_exception(e)
+            else:
+                job["future"].set_result(result)
+            finally:
+                _local.endpoint = None
+
@@ -4,3 +4,20 @@ import tweepy
 def fetch_user_tweets(twitter_api, user_id, count=100):
     tweets = twitter_api.get_users_tweets(id=user_id, max_results=count)
     return [tweet.text for tweet in tweets.data]
+
+def fetch_user_tweets_since(twitter_api, user_id, since_id=None, count=100, tweet_fields=None):
+    """
+    Fetch a user's tweets newer than since_id, following pagination.
+    Without a since_id only the latest page is fetched. Returns tweet objects, newest first.
+    """
+    params = {"id": user_id, "max_results": count}
+    if tweet_fields:
+        params["tweet_fields"] = tweet_fields
+    if since_id:
+        params["since_id"] = since_id
+    tweets = []
+    for page in tweepy.Paginator(twitter_api.get_users_tweets, **params):
+        tweets.extend(page.data or [])
+        if not since_id:
+            break
+    return tweets
@@ -0,0 +1,117 @@
+# utils/user_cache.py
+# Resolves Twitter user IDs <-> usernames from expansion payloads first,
+# then batch lookups, keeping results in a bounded TTL cache.
+
+import time
+import threading
+import tweepy
+from collections import OrderedDict
+from config.config import USER_CACHE_MAX_SIZE, USER_CACHE_TTL
+from utils.logging_config import logging
+
+USERS_LOOKUP_BATCH_SIZE = 100  # Max IDs/usernames accepted by the multi-user lookup
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a fixed TTL."""
+
+    def __init__(self, max_size=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+# Shared caches: user ID -> username and lowercased username -> user ID
+usernames_by_id = TTLCache()
+ids_by_username = TTLCache()
+
+
+def cache_users(users):
+    """Cache users from an `includes["users"]` expansion or a users lookup response."""
+    for user in users or []:
+        usernames_by_id.set(str(user.id), user.username)
+        ids_by_username.set(user.username.lower(), user.id)
+
+
+def _batches(items, size=USERS_LOOKUP_BATCH_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def resolve_usernames(client, author_ids, includes=None):
+    """
+    Map author IDs to usernames, reading the expansion payload first, then the cache,
+    then batch-fetching whatever is still missing (up to 100 IDs per request).
+    """
+    if includes:
+        cache_users(includes.get("users"))
+
+    resolved = {}
+    missing = []
+    for author_id in dict.fromkeys(author_ids):
+        username = usernames_by_id.get(str(author_id))
+        if username is None:
+            missing.append(author_id)
+        else:
+            resolved[author_id] = username
+
+    for batch in _batches(missing):
+        try:
+            response = client.get_users(ids=batch, user_fields=["username"])
+            cache_users(response.data)
+        except tweepy.TweepyException as e:
+            logging.error(f"Error batch-fetching usernames for {len(batch)} author IDs: {e}")
+        for author_id in batch:
+            username = usernames_by_id.get(str(author_id))
+            if username is not None:
+                resolved[author_id] = username
+
+    return resolved
+
+
+def resolve_user_ids(client, usernames):
+    """Map usernames to user IDs using the cache, batch-fetching the rest."""
+    resolved = {}
+    missing = []
+    for username in dict.fromkeys(usernames):
+        user_id = ids_by_username.get(username.lower())
+        if user_id is None:
+            missing.append(username)
+        else:
+            resolved[username] = user_id
+
+    for batch in _batches(missing):
+        try:
+            response = client.get_users(usernames=batch)
+            cache_users(response.data)
+        except tweepy.TweepyException as e:
+            logging.error(f"Error batch-fetching user IDs for {batch}: {e}")
+        for username in batch:
+            user_id = ids_by_username.get(username.lower())
+            if user_id is not None:
+                resolved[username] = user_id
+
+    return resolved